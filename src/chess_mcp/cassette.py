@@ -0,0 +1,165 @@
+"""Record and replay of upstream Chess.com API exchanges."""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+import structlog
+
+from chess_mcp.spool import WIRE_HEADERS, iter_response_text, read_response
+
+logger = structlog.get_logger(__name__)
+
+
+class CassetteMissError(httpx.RequestError):
+    """Raised in replay mode when the cassette holds no matching exchange."""
+
+
+def exchange_key(url: str, params: Optional[Dict[str, Any]], accept: str) -> str:
+    """
+    Build the key an exchange is recorded and looked up under.
+
+    Args:
+        url: The request URL without query string
+        params: Optional query parameters
+        accept: The request's accept header
+
+    Returns:
+        The full request URL followed by the accept header
+    """
+    return f"{httpx.URL(url, params=params or {})} {accept}"
+
+
+@dataclass
+class Cassette:
+    """
+    A JSON Lines file holding one upstream exchange per line.
+
+    Each line stores the request URL and headers, the response status, headers
+    and body, and the time the exchange took. Exchanges recorded more than once
+    for the same request are replayed in order, repeating the last one.
+    """
+
+    path: str
+    exchanges: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    positions: Dict[str, int] = field(default_factory=dict)
+
+    def load(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Read the cassette file, once.
+
+        Returns:
+            Recorded exchanges grouped by exchange key
+        """
+        if self.exchanges is None:
+            self.exchanges = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            exchange = json.loads(line)
+                            self.exchanges.setdefault(exchange["key"], []).append(exchange)
+            logger.info(
+                "Loaded cassette",
+                path=self.path,
+                requests=len(self.exchanges)
+            )
+        return self.exchanges
+
+    def record(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        response: httpx.Response,
+        elapsed: float
+    ) -> None:
+        """
+        Append an exchange to the cassette file.
+
+        Args:
+            url: The request URL without query string
+            params: Optional query parameters
+            headers: The request headers
+            response: The upstream response
+            elapsed: Seconds the exchange took
+        """
+        exchange = {
+            "key": exchange_key(url, params, headers.get("accept", "")),
+            "url": str(httpx.URL(url, params=params or {})),
+            "request_headers": headers,
+            "status": response.status_code,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in WIRE_HEADERS
+            },
+            "elapsed": round(elapsed, 6),
+        }
+        # The body goes last and is escaped chunk by chunk, so a body spilled
+        # to disk is streamed into the cassette rather than read into memory.
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(exchange, separators=(",", ":"))[:-1] + ',"body":"')
+            for text in iter_response_text(response):
+                f.write(json.dumps(text)[1:-1])
+            f.write('"}\n')
+        logger.debug("Recorded exchange", path=self.path, url=exchange["url"])
+
+    async def replay(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        latency: bool = False,
+        max_bytes: int = 0
+    ) -> httpx.Response:
+        """
+        Serve a recorded exchange without touching the network.
+
+        Args:
+            url: The request URL without query string
+            params: Optional query parameters
+            headers: The request headers
+            latency: Whether to wait for the originally recorded duration
+            max_bytes: Largest body kept in memory, as for read_response()
+
+        Returns:
+            The recorded response, read through read_response() so bodies past
+            max_bytes are spilled to disk as they would be when live
+
+        Raises:
+            CassetteMissError: If no exchange was recorded for the request
+        """
+        request = httpx.Request("GET", url, params=params or {}, headers=headers)
+        key = exchange_key(url, params, headers.get("accept", ""))
+        recorded = self.load().get(key)
+        if not recorded:
+            raise CassetteMissError(f"No recorded exchange for {key}", request=request)
+
+        position = self.positions.get(key, 0)
+        exchange = recorded[min(position, len(recorded) - 1)]
+        self.positions[key] = position + 1
+
+        if latency:
+            await asyncio.sleep(exchange["elapsed"])
+
+        logger.debug("Replayed exchange", path=self.path, url=exchange["url"])
+        response = httpx.Response(
+            exchange["status"],
+            headers=exchange["headers"],
+            stream=httpx.ByteStream(exchange["body"].encode("utf-8")),
+            request=request
+        )
+        return await read_response(response, max_bytes)
+
+
+_cassettes: Dict[str, Cassette] = {}
+
+
+def get_cassette(path: str) -> Cassette:
+    """Return the shared cassette for a file path."""
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path)
+    return _cassettes[path]
@@ -0,0 +1,241 @@
+"""Vectorized clock-usage and time-management statistics."""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from chess_mcp.pgn import extract_clock_series
+
+
+def clock_matrix(series: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Pack ragged per-game clock series into a NaN-padded matrix.
+
+    Args:
+        series: Clock readings per game, one entry per move
+
+    Returns:
+        Array of shape (games, longest game) with NaN after each game's end
+    """
+    lengths = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+    width = int(lengths.max()) if len(series) else 0
+    matrix = np.full((len(series), width), np.nan)
+    if width:
+        matrix[np.arange(width) < lengths[:, None]] = np.fromiter(
+            (clock for s in series for clock in s), dtype=np.float64, count=int(lengths.sum())
+        )
+    return matrix
+
+
+@dataclass
+class ClockArrays:
+    """
+    Clock series of a set of games packed into NumPy arrays, one row per game.
+
+    own and opponent are NaN-padded matrices of the clock left after each of
+    the player's and the opponent's moves, see clock_matrix().
+    """
+
+    own: np.ndarray
+    opponent: np.ndarray
+    base: np.ndarray
+    increment: np.ndarray
+    score: np.ndarray
+
+    @property
+    def games(self) -> int:
+        """Number of games."""
+        return len(self.score)
+
+    @classmethod
+    def from_series(cls, games: Sequence[Dict[str, Any]]) -> "ClockArrays":
+        """
+        Pack records produced by chess_mcp.pgn.extract_clock_series().
+
+        Args:
+            games: Clock series records
+
+        Returns:
+            The records' clock arrays
+        """
+        return cls(
+            own=clock_matrix([game["own"] for game in games]),
+            opponent=clock_matrix([game["opponent"] for game in games]),
+            base=np.array([game["base"] for game in games], dtype=np.float64),
+            increment=np.array([game["increment"] for game in games], dtype=np.float64),
+            score=np.array([game["score"] for game in games], dtype=np.float64),
+        )
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["ClockArrays"]) -> "ClockArrays":
+        """
+        Stack the games of several sets, padding the clock matrices to a common width.
+
+        Args:
+            parts: Sets of games to combine
+
+        Returns:
+            The games of all parts, in order
+        """
+        return cls(
+            own=_stack_padded([part.own for part in parts]),
+            opponent=_stack_padded([part.opponent for part in parts]),
+            base=np.concatenate([part.base for part in parts]) if parts else np.empty(0),
+            increment=np.concatenate([part.increment for part in parts]) if parts else np.empty(0),
+            score=np.concatenate([part.score for part in parts]) if parts else np.empty(0),
+        )
+
+
+def _stack_padded(matrices: Sequence[np.ndarray]) -> np.ndarray:
+    """Stack NaN-padded matrices of differing widths into one."""
+    rows = sum(matrix.shape[0] for matrix in matrices)
+    width = max((matrix.shape[1] for matrix in matrices), default=0)
+    stacked = np.full((rows, width), np.nan)
+    row = 0
+    for matrix in matrices:
+        stacked[row:row + matrix.shape[0], :matrix.shape[1]] = matrix
+        row += matrix.shape[0]
+    return stacked
+
+
+def clock_arrays(games: Union[str, Iterable[str]], username: str) -> Dict[str, ClockArrays]:
+    """
+    Extract a chunk of a player's games' clock series packed by time class.
+
+    Args:
+        games: Multi-game PGN text, or single-game PGN strings
+        username: The player whose games are extracted
+
+    Returns:
+        Clock arrays per time class
+    """
+    by_time_class: Dict[str, List[Dict[str, Any]]] = {}
+    for game in extract_clock_series(games, username):
+        by_time_class.setdefault(game["time_class"], []).append(game)
+    return {
+        time_class: ClockArrays.from_series(series)
+        for time_class, series in by_time_class.items()
+    }
+
+
+@dataclass
+class ClockCache:
+    """
+    Cache of packed clock arrays per monthly archive, bounded by games held.
+
+    Once the cache holds more than max_games games, the least recently used
+    months are evicted, as in chess_mcp.store.GameStore.
+    """
+
+    max_games: int = 50_000
+    entries: "OrderedDict[Tuple[str, int, int], Dict[str, ClockArrays]]" = field(
+        default_factory=OrderedDict
+    )
+    total_games: int = 0
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[Dict[str, ClockArrays]]:
+        """Return a month's clock arrays per time class, if cached."""
+        arrays = self.entries.get(key)
+        if arrays is not None:
+            self.entries.move_to_end(key)
+        return arrays
+
+    def put(self, key: Tuple[str, int, int], arrays: Dict[str, ClockArrays]) -> None:
+        """
+        Store a month's clock arrays, evicting the least recently used months if full.
+
+        Args:
+            key: (username, year, month), with the username lower-cased
+            arrays: Clock arrays per time class
+        """
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.total_games -= _game_count(previous)
+        self.entries[key] = arrays
+        self.total_games += _game_count(arrays)
+        while self.total_games > self.max_games and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_games -= _game_count(evicted)
+
+    def clear(self) -> None:
+        """Drop all cached months."""
+        self.entries.clear()
+        self.total_games = 0
+
+
+def _game_count(arrays: Dict[str, ClockArrays]) -> int:
+    """Number of games across a month's time classes."""
+    return sum(part.games for part in arrays.values())
+
+
+def time_management_stats(
+    clocks: ClockArrays,
+    scramble_seconds: float = 10.0,
+    checkpoint_move: int = 20,
+    max_moves: int = 60
+) -> Dict[str, Any]:
+    """
+    Compute time-management statistics over a player's games.
+
+    Args:
+        clocks: The games' clock arrays
+        scramble_seconds: Clock level below which a game counts as a time scramble
+        checkpoint_move: Move number at which clock advantage is compared with the result
+        max_moves: Number of moves to report average time per move for
+
+    Returns:
+        Average time per move by move number, time-scramble rate and the
+        relation between clock advantage at the checkpoint move and the result
+    """
+    if not clocks.games:
+        return {
+            "games": 0,
+            "average_time_per_move": {},
+            "time_scramble_rate": None,
+            "clock_advantage": None,
+        }
+
+    own, opponent, score = clocks.own, clocks.opponent, clocks.score
+    base, increment = clocks.base, clocks.increment
+
+    previous = np.concatenate([base[:, None], own[:, :-1]], axis=1)
+    spent = (previous - own + increment[:, None])[:, :max_moves]
+    reached = np.count_nonzero(~np.isnan(spent), axis=0)
+    average_spent = np.nansum(spent, axis=0) / np.maximum(reached, 1)
+
+    scrambles = np.nanmin(own, axis=1) < scramble_seconds
+
+    clock_advantage = None
+    index = checkpoint_move - 1
+    if own.shape[1] > index and opponent.shape[1] > index:
+        advantage = own[:, index] - opponent[:, index]
+        valid = ~np.isnan(advantage)
+        advantage, result = advantage[valid], score[valid]
+        ahead, behind = advantage > 0, advantage < 0
+        clock_advantage = {
+            "move": checkpoint_move,
+            "games": int(valid.sum()),
+            "average_advantage_by_result": {
+                label: _rounded_mean(advantage[result == value])
+                for label, value in (("win", 1.0), ("draw", 0.5), ("loss", 0.0))
+            },
+            "score_when_ahead": _rounded_mean(result[ahead]),
+            "score_when_behind": _rounded_mean(result[behind]),
+        }
+
+    return {
+        "games": clocks.games,
+        "average_time_per_move": {
+            int(move) + 1: round(float(average_spent[move]), 2)
+            for move in np.flatnonzero(reached)
+        },
+        "time_scramble_rate": round(float(scrambles.mean()), 4),
+        "clock_advantage": clock_advantage,
+    }
+
+
+def _rounded_mean(values: np.ndarray) -> Any:
+    """Return the mean of values rounded to two decimals, or None if empty."""
+    return round(float(values.mean()), 2) if values.size else None
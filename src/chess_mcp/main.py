@@ -1,14 +1,17 @@
 #!/usr/bin/env python
 """Main entry point for the Chess.com MCP Server."""
 
+import asyncio
 import logging
+import signal
 import sys
 from typing import Literal
 
 import structlog
 from dotenv import load_dotenv
 
-from chess_mcp.server import mcp
+from chess_mcp.profiling import profiler
+from chess_mcp.server import config, mcp
 
 logger = structlog.get_logger(__name__)
 
@@ -22,6 +25,7 @@ def setup_environment() -> bool:
     """
     try:
         load_dotenv()
+        config.load_from_env()
 
         structlog.configure(
             processors=[
@@ -45,6 +49,33 @@ def setup_environment() -> bool:
         return False
 
 
+def toggle_profiling(*_: object) -> None:
+    """Switch profiling on or off with the configured options, e.g. on SIGUSR1."""
+    profiler.toggle(
+        mcp,
+        output_dir=config.profile_dir,
+        cprofile=config.profile_cprofile,
+        sample_interval=config.profile_sample_interval
+    )
+
+
+def _on_profiling_signal(*_: object) -> None:
+    """
+    Handle SIGUSR1 by toggling profiling from the event loop.
+
+    FastMCP creates the event loop inside mcp.run(), so the handler cannot be
+    registered with loop.add_signal_handler() beforehand. Instead the toggle
+    is scheduled as a loop callback, so swapping the tools and joining the
+    sampler thread never run at an arbitrary point inside interrupted code.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        toggle_profiling()
+    else:
+        loop.call_soon_threadsafe(toggle_profiling)
+
+
 def run_server(transport: Literal["stdio", "sse"] = "stdio") -> None:
     """
     Main entry point for the Chess.com MCP Server.
@@ -56,6 +87,11 @@ def run_server(transport: Literal["stdio", "sse"] = "stdio") -> None:
         logger.error("Environment setup failed, exiting")
         sys.exit(1)
 
+    if config.profile_enabled:
+        toggle_profiling()
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, _on_profiling_signal)
+
     try:
         logger.info("Starting MCP server", transport=transport)
         mcp.run(transport=transport)
@@ -69,6 +105,8 @@ def run_server(transport: Literal["stdio", "sse"] = "stdio") -> None:
             exc_info=True
         )
         sys.exit(1)
+    finally:
+        profiler.stop(mcp)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+"""In-process counters reporting the server's internal activity."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+def _series(labels: Dict[str, Any]) -> str:
+    """Format labels as a series name, e.g. "family=player"."""
+    return ",".join(f"{key}={labels[key]}" for key in sorted(labels)) or "total"
+
+
+@dataclass
+class Metrics:
+    """Named counters and timings, optionally split by labels."""
+
+    counters: Dict[str, Counter] = field(default_factory=dict)
+    timings: Dict[str, Dict[str, Dict[str, float]]] = field(default_factory=dict)
+
+    def incr(self, name: str, value: int = 1, **labels: Any) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: The counter name
+            value: Amount to add
+            **labels: Labels identifying the series, e.g. family="player"
+        """
+        self.counters.setdefault(name, Counter())[_series(labels)] += value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """
+        Record a duration.
+
+        Args:
+            name: The timing name
+            seconds: The observed duration
+            **labels: Labels identifying the series, e.g. priority="bulk"
+        """
+        timing = self.timings.setdefault(name, {}).setdefault(
+            _series(labels), {"count": 0, "total": 0.0, "max": 0.0}
+        )
+        timing["count"] += 1
+        timing["total"] += seconds
+        timing["max"] = max(timing["max"], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Return a copy of all counters, grouped by name then series."""
+        return {name: dict(series) for name, series in sorted(self.counters.items())}
+
+    def timings_snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return count, total, mean and max of all timings, grouped by name then series."""
+        return {
+            name: {
+                series: {**timing, "mean": timing["total"] / timing["count"]}
+                for series, timing in all_series.items()
+            }
+            for name, all_series in sorted(self.timings.items())
+        }
+
+    def reset(self) -> None:
+        """Reset all counters and timings."""
+        self.counters.clear()
+        self.timings.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,304 @@
+"""PGN parsing and per-game analytics for Chess.com game archives.
+
+Functions in this module are pure and picklable so that they can run in a
+worker process (see chess_mcp.pool).
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+HEADER_RE = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$', re.MULTILINE)
+CLOCK_RE = re.compile(r"\[%clk (\d+):(\d+):(\d+(?:\.\d+)?)\]")
+COMMENT_RE = re.compile(r"\{[^}]*\}")
+GAME_START_RE = re.compile(r"^(?=\[Event )", re.MULTILINE)
+RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+LENGTH_BUCKET = 10
+
+
+def split_games(pgn: str) -> List[str]:
+    """
+    Split a multi-game PGN into single games.
+
+    Args:
+        pgn: Multi-game PGN text
+
+    Returns:
+        One PGN string per game
+    """
+    return [game for game in GAME_START_RE.split(pgn) if game.strip()]
+
+
+def chunk_bounds(pgn: str, size: int) -> List[Tuple[int, int]]:
+    """
+    Find the boundaries of work units of at most size games in a multi-game PGN.
+
+    Args:
+        pgn: Multi-game PGN text
+        size: Maximum number of games per chunk
+
+    Returns:
+        (start, end) character offsets of each chunk
+    """
+    starts = [match.start() for match in GAME_START_RE.finditer(pgn)]
+    return [
+        (starts[i], starts[i + size] if i + size < len(starts) else len(pgn))
+        for i in range(0, len(starts), size)
+    ]
+
+
+def parse_game(pgn: str) -> Tuple[Dict[str, str], str]:
+    """
+    Split a single game into its headers and movetext.
+
+    Args:
+        pgn: Single-game PGN text
+
+    Returns:
+        Tuple of (headers, movetext)
+    """
+    headers = dict(HEADER_RE.findall(pgn))
+    movetext = HEADER_RE.sub("", pgn).strip()
+    return headers, movetext
+
+
+def parse_clocks(movetext: str) -> List[float]:
+    """
+    Extract the %clk annotations of a game.
+
+    Args:
+        movetext: The game's movetext
+
+    Returns:
+        Seconds left on the mover's clock after each half-move
+    """
+    return [
+        int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        for hours, minutes, seconds in CLOCK_RE.findall(movetext)
+    ]
+
+
+def count_plies(movetext: str) -> int:
+    """
+    Count the half-moves played in a game.
+
+    Args:
+        movetext: The game's movetext
+
+    Returns:
+        Number of half-moves
+    """
+    tokens = COMMENT_RE.sub(" ", movetext).split()
+    return sum(
+        1 for token in tokens
+        if token not in RESULTS and not token[0].isdigit() and not token.startswith("$")
+    )
+
+
+def parse_time_control(time_control: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a live game's TimeControl header.
+
+    Args:
+        time_control: Header value such as "180" or "180+2"
+
+    Returns:
+        Tuple of (base seconds, increment seconds), or None for daily games
+    """
+    if not time_control or "/" in time_control or time_control == "-":
+        return None
+    base, _, increment = time_control.partition("+")
+    return int(base), int(increment or 0)
+
+
+def time_class(time_control: str) -> str:
+    """
+    Classify a TimeControl header the way Chess.com does.
+
+    Args:
+        time_control: Header value such as "180+2" or "1/86400"
+
+    Returns:
+        "bullet", "blitz", "rapid" or "daily"
+    """
+    parsed = parse_time_control(time_control)
+    if parsed is None:
+        return "daily"
+    estimated = parsed[0] + 40 * parsed[1]
+    if estimated < 180:
+        return "bullet"
+    if estimated < 600:
+        return "blitz"
+    return "rapid"
+
+
+def player_color(headers: Dict[str, str], username: str) -> Optional[str]:
+    """Return "white" or "black" for the player, or None if they did not play."""
+    if headers.get("White", "").lower() == username.lower():
+        return "white"
+    if headers.get("Black", "").lower() == username.lower():
+        return "black"
+    return None
+
+
+def analyze_chunk(
+    games: Union[str, Iterable[str]],
+    username: str,
+    time_trouble_seconds: float = 10.0,
+    game_time_class: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Compute mergeable analytics for a chunk of a player's games.
+
+    Args:
+        games: Multi-game PGN text, or single-game PGN strings
+        username: The player the analytics are computed for
+        time_trouble_seconds: Clock level below which the player is in time trouble
+        game_time_class: Only include games of this time class, if given
+
+    Returns:
+        Partial analytics, to be combined with merge_analytics()
+    """
+    partial: Dict[str, Any] = {
+        "games": 0,
+        "moves": 0,
+        "clock_games": 0,
+        "time_trouble_games": 0,
+        "length_histogram": Counter(),
+        "time_per_move_total": Counter(),
+        "time_per_move_count": Counter(),
+    }
+
+    if isinstance(games, str):
+        games = split_games(games)
+    for pgn in games:
+        headers, movetext = parse_game(pgn)
+        color = player_color(headers, username)
+        time_control = headers.get("TimeControl", "")
+        if color is None or (game_time_class and time_class(time_control) != game_time_class):
+            continue
+
+        moves = (count_plies(movetext) + 1) // 2
+        partial["games"] += 1
+        partial["moves"] += moves
+        partial["length_histogram"][moves // LENGTH_BUCKET * LENGTH_BUCKET] += 1
+
+        parsed = parse_time_control(time_control)
+        clocks = parse_clocks(movetext)[0 if color == "white" else 1::2]
+        if parsed is None or not clocks:
+            continue
+
+        base, increment = parsed
+        partial["clock_games"] += 1
+        if min(clocks) < time_trouble_seconds:
+            partial["time_trouble_games"] += 1
+
+        previous = float(base)
+        for move_number, clock in enumerate(clocks, start=1):
+            partial["time_per_move_total"][move_number] += previous - clock + increment
+            partial["time_per_move_count"][move_number] += 1
+            previous = clock
+
+    return partial
+
+
+def player_score(headers: Dict[str, str], color: str) -> Optional[float]:
+    """Return the player's score (1, 0.5 or 0) from the Result header."""
+    result = headers.get("Result")
+    if result == "1/2-1/2":
+        return 0.5
+    if result in ("1-0", "0-1"):
+        return 1.0 if (result == "1-0") == (color == "white") else 0.0
+    return None
+
+
+def extract_clock_series(
+    games: Union[str, Iterable[str]],
+    username: str,
+    game_time_class: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract both players' clock series from a chunk of a player's games.
+
+    Games without %clk annotations after any of the player's moves, daily
+    games and unfinished games are skipped.
+
+    Args:
+        games: Multi-game PGN text, or single-game PGN strings
+        username: The player whose games are extracted
+        game_time_class: Only include games of this time class, if given
+
+    Returns:
+        One record per game with the time class and control, the player's score
+        and the clock left after each of the player's and the opponent's moves
+    """
+    if isinstance(games, str):
+        games = split_games(games)
+    series = []
+    for pgn in games:
+        headers, movetext = parse_game(pgn)
+        color = player_color(headers, username)
+        time_control = headers.get("TimeControl", "")
+        parsed = parse_time_control(time_control)
+        if color is None or parsed is None:
+            continue
+        if game_time_class and time_class(time_control) != game_time_class:
+            continue
+
+        score = player_score(headers, color)
+        clocks = parse_clocks(movetext)
+        own = clocks[0::2] if color == "white" else clocks[1::2]
+        if score is None or not own:
+            continue
+
+        series.append({
+            "time_class": time_class(time_control),
+            "base": parsed[0],
+            "increment": parsed[1],
+            "score": score,
+            "own": own,
+            "opponent": clocks[1::2] if color == "white" else clocks[0::2],
+        })
+    return series
+
+
+def merge_analytics(partials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine partial analytics and compute the final statistics.
+
+    Args:
+        partials: Results of analyze_chunk()
+
+    Returns:
+        Game counts, average game length, game-length distribution, average
+        time used per move number and time-trouble frequency
+    """
+    games = moves = clock_games = time_trouble_games = 0
+    length_histogram: Counter = Counter()
+    time_total: Counter = Counter()
+    time_count: Counter = Counter()
+
+    for partial in partials:
+        games += partial["games"]
+        moves += partial["moves"]
+        clock_games += partial["clock_games"]
+        time_trouble_games += partial["time_trouble_games"]
+        length_histogram.update(partial["length_histogram"])
+        time_total.update(partial["time_per_move_total"])
+        time_count.update(partial["time_per_move_count"])
+
+    return {
+        "games": games,
+        "average_moves": round(moves / games, 2) if games else None,
+        "game_length_distribution": {
+            f"{start}-{start + LENGTH_BUCKET - 1}": count
+            for start, count in sorted(length_histogram.items())
+        },
+        "games_with_clock": clock_games,
+        "time_trouble_rate": round(time_trouble_games / clock_games, 4) if clock_games else None,
+        "average_time_per_move": {
+            move: round(time_total[move] / time_count[move], 2)
+            for move in sorted(time_count)
+        },
+    }
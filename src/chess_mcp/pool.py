@@ -0,0 +1,108 @@
+"""Process pool for CPU-bound work, keeping it off the asyncio event loop."""
+
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterable, Callable, Deque, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def get_executor(workers: Optional[int]) -> Executor:
+    """
+    Return the shared executor, creating it on first use.
+
+    Args:
+        workers: Number of worker processes; None uses the CPU count and 0
+            runs work in a single background thread instead of processes
+
+    Returns:
+        The shared executor
+    """
+    global _executor
+    if _executor is None:
+        if workers == 0:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chess-mcp")
+        else:
+            # Forking a process that runs an event loop and other threads is
+            # unsafe, so workers are always spawned.
+            _executor = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        logger.info("Started worker pool", workers=workers, kind=type(_executor).__name__)
+    return _executor
+
+
+async def run_in_pool(workers: Optional[int], fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a picklable function in the shared executor.
+
+    Args:
+        workers: Worker count used if the executor has to be created
+        fn: Module-level function to run
+        *args: Picklable arguments
+
+    Returns:
+        The function's result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(workers), fn, *args)
+
+
+async def map_in_pool(
+    workers: Optional[int],
+    fn: Callable[..., Any],
+    args: AsyncIterable[Tuple[Any, ...]],
+    window: Optional[int] = None
+) -> List[Any]:
+    """
+    Run a function in the shared executor for each argument tuple of a stream.
+
+    The stream is consumed lazily and at most window calls are in flight at a
+    time, so only that many inputs are held in memory while the stream, e.g.
+    a download, makes progress in between.
+
+    Args:
+        workers: Worker count used if the executor has to be created
+        fn: Module-level function to run
+        args: Picklable argument tuples, one per call
+        window: Maximum calls in flight, defaults to the worker count
+
+    Returns:
+        The function's results, in stream order
+    """
+    window = window or workers or os.cpu_count() or 1
+    pending: Deque[asyncio.Future] = deque()
+    results = []
+    try:
+        async for call_args in args:
+            if len(pending) >= window:
+                results.append(await pending.popleft())
+            pending.append(asyncio.ensure_future(run_in_pool(workers, fn, *call_args)))
+        while pending:
+            results.append(await pending.popleft())
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    finally:
+        # Let the stream release what it holds, e.g. a spilled archive.
+        aclose = getattr(args, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return results
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared executor, if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,294 @@
+"""Opt-in profiling of tool calls and the upstream request path.
+
+While enabled, every tool call writes a line to timings.jsonl in the output
+directory with its per-phase timings (queue, connect, ttfb, download, decode,
+serialize and total), and a sampler thread records the event loop thread's
+call stacks in collapsed-stack format (stacks.collapsed), ready for
+flamegraph.pl or speedscope. Optionally each tool call is also captured with
+cProfile.
+
+Profiling replaces the registered tools with profiled copies only while it is
+enabled, so when it is off tool calls run exactly as registered.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+import structlog
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.fastmcp.tools import Tool
+from pydantic import PrivateAttr
+
+logger = structlog.get_logger(__name__)
+
+_NULL_PHASE = nullcontext()
+
+# Phase timings of the tool call currently being profiled, if any.
+current_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "chess_mcp_profile_phases", default=None
+)
+
+
+def add_phase(name: str, seconds: float) -> None:
+    """Add time to a phase of the tool call being profiled, if any."""
+    phases = current_phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Time a block as a phase of the tool call being profiled.
+
+    Returns a shared no-op context manager when no call is being profiled.
+    """
+    if current_phases.get() is None:
+        return _NULL_PHASE
+    return _timed_phase(name)
+
+
+@contextmanager
+def _timed_phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to a phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(name, time.perf_counter() - start)
+
+
+class HTTPTrace:
+    """
+    httpx trace extension hook deriving connect and TTFB phase timings.
+
+    Connect covers TCP connect and TLS handshake; TTFB runs from sending the
+    request headers until the response headers have been received.
+    """
+
+    def __init__(self) -> None:
+        self.started: Dict[str, float] = {}
+
+    async def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        step, _, status = event.rpartition(".")
+        if status == "started":
+            self.started[step] = time.perf_counter()
+        elif status == "complete" and step in self.started:
+            if step in ("connection.connect_tcp", "connection.start_tls"):
+                add_phase("connect", time.perf_counter() - self.started[step])
+            elif step.endswith(".receive_response_headers"):
+                sent = next(
+                    (t for s, t in self.started.items() if s.endswith(".send_request_headers")),
+                    self.started[step]
+                )
+                add_phase("ttfb", time.perf_counter() - sent)
+
+
+def _frame_stack(frame: Any) -> str:
+    """Format a frame's call stack, outermost first, as a collapsed-stack line."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+@dataclass
+class StackSampler:
+    """Background thread sampling one thread's call stack at a fixed interval."""
+
+    thread_id: int
+    interval: float
+    stacks: Counter = field(default_factory=Counter)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(target=self._run, name="chess-mcp-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_frame_stack(frame)] += 1
+
+    def write(self, path: str) -> None:
+        """Write the samples in collapsed-stack format."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class ProfiledTool(Tool):
+    """
+    A registered tool that records the phase timings of each call.
+
+    The serialize phase times FastMCP's conversion of the tool's result into
+    MCP content; encoding the response message for the transport is not
+    included.
+    """
+
+    _profiler: "Profiler" = PrivateAttr()
+
+    @classmethod
+    def of(cls, tool: Tool, profiler: "Profiler") -> "ProfiledTool":
+        """Create a profiled copy of a registered tool."""
+        profiled = cls.model_construct(**{name: getattr(tool, name) for name in Tool.model_fields})
+        profiled._profiler = profiler
+        return profiled
+
+    async def run(
+        self,
+        arguments: Dict[str, Any],
+        context: Any = None,
+        convert_result: bool = False
+    ) -> Any:
+        phases: Dict[str, float] = {}
+        token = current_phases.set(phases)
+        profile = self._profiler.start_cprofile()
+        start = time.perf_counter()
+        try:
+            result = await super().run(arguments, context)
+            if convert_result:
+                with _timed_phase("serialize"):
+                    try:
+                        result = self.fn_metadata.convert_result(result)
+                    except Exception as e:
+                        raise ToolError(f"Error executing tool {self.name}: {e}") from e
+            return result
+        finally:
+            phases["total"] = time.perf_counter() - start
+            current_phases.reset(token)
+            self._profiler.dump_cprofile(profile, self.name)
+            self._profiler.write_timings(self.name, phases)
+
+
+@dataclass
+class Profiler:
+    """Switches profiling of the server's tools on and off."""
+
+    enabled: bool = False
+    output_dir: str = "chess_mcp_profile"
+    cprofile: bool = False
+    sampler: Optional[StackSampler] = None
+    originals: Dict[str, Tool] = field(default_factory=dict)
+    _cprofile_active: bool = False
+
+    def start(
+        self,
+        server: Any,
+        output_dir: Optional[str] = None,
+        cprofile: bool = False,
+        sample_interval: float = 0.005
+    ) -> None:
+        """
+        Enable profiling.
+
+        Args:
+            server: The FastMCP server whose tools are profiled
+            output_dir: Directory for timings, collapsed stacks and cProfile dumps
+            cprofile: Whether to also capture each tool call with cProfile
+            sample_interval: Seconds between stack samples, 0 disables sampling
+        """
+        if self.enabled:
+            return
+        self.output_dir = output_dir or self.output_dir
+        self.cprofile = cprofile
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        tools = server._tool_manager._tools
+        for name, tool in tools.items():
+            self.originals[name] = tool
+            tools[name] = ProfiledTool.of(tool, self)
+
+        if sample_interval > 0:
+            self.sampler = StackSampler(threading.get_ident(), sample_interval)
+            self.sampler.start()
+
+        self.enabled = True
+        logger.info(
+            "Profiling enabled",
+            output_dir=self.output_dir,
+            cprofile=cprofile,
+            sample_interval=sample_interval
+        )
+
+    def stop(self, server: Any) -> None:
+        """
+        Disable profiling, restoring the tools and writing the collapsed stacks.
+
+        Args:
+            server: The FastMCP server passed to start()
+        """
+        if not self.enabled:
+            return
+        server._tool_manager._tools.update(self.originals)
+        self.originals.clear()
+
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler.write(os.path.join(self.output_dir, "stacks.collapsed"))
+            self.sampler = None
+
+        self.enabled = False
+        logger.info("Profiling disabled", output_dir=self.output_dir)
+
+    def toggle(self, server: Any, **kwargs: Any) -> None:
+        """Enable profiling if it is off, otherwise disable it."""
+        if self.enabled:
+            self.stop(server)
+        else:
+            self.start(server, **kwargs)
+
+    def start_cprofile(self) -> Optional[cProfile.Profile]:
+        """
+        Start a cProfile capture of a tool call, if enabled.
+
+        Returns:
+            The running profile, or None if cProfile capture is off or another
+            call is already being captured (only one can be active per thread)
+        """
+        if not self.cprofile or self._cprofile_active:
+            return None
+        profile = cProfile.Profile()
+        self._cprofile_active = True
+        profile.enable()
+        return profile
+
+    def dump_cprofile(self, profile: Optional[cProfile.Profile], name: str) -> None:
+        """Stop a capture started by start_cprofile() and write it to the output directory."""
+        if profile is None:
+            return
+        profile.disable()
+        self._cprofile_active = False
+        profile.dump_stats(os.path.join(self.output_dir, f"{name}-{time.time_ns()}.prof"))
+
+    def write_timings(self, name: str, phases: Dict[str, float]) -> None:
+        """Append a tool call's phase timings to timings.jsonl."""
+        entry = {
+            "tool": name,
+            "timestamp": time.time(),
+            "phases": {key: round(value, 6) for key, value in sorted(phases.items())},
+        }
+        with open(os.path.join(self.output_dir, "timings.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+profiler = Profiler()
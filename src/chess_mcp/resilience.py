@@ -0,0 +1,285 @@
+"""Hedged requests and circuit breaking for upstream Chess.com API calls."""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+import httpx
+import structlog
+
+from chess_mcp.metrics import metrics
+from chess_mcp.spool import SPOOLED_BODY
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Raised when a request is rejected because its circuit is open."""
+
+
+def endpoint_family(endpoint: str) -> str:
+    """
+    Group an endpoint with others that share its upstream route.
+
+    Usernames, club IDs, titles and dates are dropped, so for example
+    "player/hikaru/games/2024/01" belongs to the "player/games" family.
+
+    Args:
+        endpoint: The API endpoint, relative to the base URL
+
+    Returns:
+        The endpoint family name
+    """
+    segments = endpoint.strip("/").split("/")
+    return "/".join([segments[0]] + [s for s in segments[2:] if not s.isdigit()])
+
+
+def is_upstream_failure(error: httpx.HTTPError) -> bool:
+    """
+    Check whether an error indicates an unhealthy upstream.
+
+    Client errors such as 404 for an unknown player mean upstream answered
+    correctly and do not count; server errors, rate limiting and transport
+    failures do.
+
+    Args:
+        error: The error raised while making the request
+
+    Returns:
+        True if the error should count against the circuit breaker
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return not isinstance(error, CircuitOpenError)
+
+
+@dataclass
+class LatencyTracker:
+    """Rolling window of observed request latencies per endpoint family."""
+
+    window: int = 200
+    samples: Dict[str, Deque[float]] = field(default_factory=dict)
+
+    def observe(self, family: str, seconds: float) -> None:
+        """Record a request latency."""
+        self.samples.setdefault(family, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, family: str, pct: float, min_samples: int) -> Optional[float]:
+        """
+        Return a latency percentile for an endpoint family.
+
+        Args:
+            family: The endpoint family
+            pct: Percentile between 0 and 100
+            min_samples: Minimum number of samples required
+
+        Returns:
+            The latency in seconds, or None if there are too few samples
+        """
+        samples = self.samples.get(family)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self.samples.clear()
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Per endpoint family circuit breaker.
+
+    After failure_threshold consecutive upstream failures the circuit opens and
+    requests fail fast. Once reset_timeout has passed a single trial request is
+    let through; its outcome closes the circuit again or re-opens it.
+    """
+
+    family: str
+    failure_threshold: int
+    reset_timeout: float
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trial_in_flight: bool = False
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent upstream.
+
+        Returns:
+            True if the request may proceed
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a healthy upstream answer."""
+        if self.opened_at is not None:
+            logger.info("Circuit closed", family=self.family)
+            metrics.incr("circuit_closed", family=self.family)
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def abandon(self) -> None:
+        """Release the trial slot of a request that ended without an answer."""
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record an upstream failure, opening the circuit past the threshold."""
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.failure_threshold <= 0:
+            return
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("Circuit opened", family=self.family, failures=self.failures)
+                metrics.incr("circuit_opened", family=self.family)
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class StaleCache:
+    """
+    Cache of the last successful result for each request, bounded by size.
+
+    Entries are sized by the response body they were decoded from. Results
+    larger than max_entry_bytes, such as monthly archives, are not kept, so
+    the cache holds the small profile and stats lookups a stale fallback is
+    meant for.
+    """
+
+    max_bytes: int = 32 * 1024 * 1024
+    max_entry_bytes: int = 1024 * 1024
+    entries: "OrderedDict[str, Tuple[Any, int]]" = field(default_factory=OrderedDict)
+    total_bytes: int = 0
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        """
+        Store a result, evicting the least recently stored ones if full.
+
+        Args:
+            key: The request's exchange key
+            value: The decoded result
+            size: Size in bytes of the response body
+        """
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= previous[1]
+        if size > self.max_entry_bytes:
+            return
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the last stored result for a request, if any."""
+        entry = self.entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def clear(self) -> None:
+        """Drop all stored results."""
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+async def hedged(
+    send: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    family: str,
+    hedge: Optional[Callable[[], Awaitable[T]]] = None
+) -> T:
+    """
+    Run a request, sending a second copy if the first is slower than delay.
+
+    Whichever copy succeeds first is used and the other one is cancelled, or
+    if it has already completed too, its spilled body is closed. If both
+    fail, the first copy's error is raised.
+
+    Args:
+        send: Factory creating a new request coroutine
+        delay: Seconds to wait before hedging, or None to never hedge
+        family: The endpoint family, for metrics
+        hedge: Factory for the second copy, defaults to send
+
+    Returns:
+        The result of the first successful request
+    """
+    if delay is None:
+        return await send()
+
+    primary = asyncio.ensure_future(send())
+    tasks = [primary]
+    winner: Optional[asyncio.Future] = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            winner = primary
+            return primary.result()
+
+        logger.debug("Sending hedged request", family=family, delay=delay)
+        metrics.incr("hedge_sent", family=family)
+        tasks.append(asyncio.ensure_future((hedge or send)()))
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task in done and task.exception() is None:
+                    if task is not primary:
+                        metrics.incr("hedge_won", family=family)
+                    winner = task
+                    return task.result()
+        return primary.result()
+    finally:
+        for task in tasks:
+            if task is winner:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is None:
+                _close_spooled(task.result())
+
+
+def _close_spooled(result: Any) -> None:
+    """Close the spilled body of a response that is being discarded, if any."""
+    if isinstance(result, httpx.Response):
+        spooled = result.extensions.get(SPOOLED_BODY)
+        if spooled is not None:
+            spooled.close()
+
+
+latencies = LatencyTracker()
+stale_cache = StaleCache()
+breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(family: str, failure_threshold: int, reset_timeout: float) -> CircuitBreaker:
+    """Return the shared circuit breaker for an endpoint family."""
+    if family not in breakers:
+        breakers[family] = CircuitBreaker(family, failure_threshold, reset_timeout)
+    return breakers[family]
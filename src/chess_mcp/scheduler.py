@@ -0,0 +1,185 @@
+"""Priority-aware scheduling of upstream requests."""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, Optional, TypeVar
+
+import structlog
+from mcp.server.lowlevel.server import request_ctx
+
+from chess_mcp.metrics import metrics
+from chess_mcp.profiling import add_phase
+
+logger = structlog.get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class Priority(IntEnum):
+    """Request priority classes, lower values are served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+request_priority: ContextVar[Priority] = ContextVar(
+    "chess_mcp_request_priority", default=Priority.INTERACTIVE
+)
+
+
+def bulk_request(fn: F) -> F:
+    """
+    Mark a tool as bulk traffic.
+
+    Upstream requests made while the tool runs, including those of tools it
+    calls, are scheduled with Priority.BULK.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = request_priority.set(Priority.BULK)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            request_priority.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def current_session() -> Hashable:
+    """
+    Identify the MCP session the current request belongs to.
+
+    Returns:
+        A key unique to the client session, or None outside of an MCP request
+    """
+    try:
+        return id(request_ctx.get().session)
+    except LookupError:
+        return None
+
+
+@dataclass
+class RequestScheduler:
+    """
+    Admission control for upstream requests.
+
+    At most max_concurrency requests run at once, of which bulk requests may
+    take all but reserved_interactive slots. Waiting interactive requests are
+    always admitted before waiting bulk requests, and within a priority class
+    waiting sessions are served round-robin so one client's bulk job cannot
+    starve another's. A waiter that is cancelled, e.g. because the client
+    abandoned the tool call, leaves the queue without taking a slot.
+    """
+
+    max_concurrency: int = 4
+    reserved_interactive: int = 1
+    active: Dict[Priority, int] = field(
+        default_factory=lambda: {priority: 0 for priority in Priority}
+    )
+    waiters: Dict[Priority, "OrderedDict[Hashable, Deque[asyncio.Future]]"] = field(
+        default_factory=lambda: {priority: OrderedDict() for priority in Priority}
+    )
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        """Check whether a request of the given priority may start now."""
+        if sum(self.active.values()) >= self.max_concurrency:
+            return False
+        if priority == Priority.BULK:
+            bulk_limit = max(1, self.max_concurrency - self.reserved_interactive)
+            return self.active[Priority.BULK] < bulk_limit
+        return True
+
+    def _has_waiters(self, priority: Priority) -> bool:
+        """Check whether requests of this or a higher priority are waiting."""
+        return any(self.waiters[p] for p in Priority if p <= priority)
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests while there is capacity, highest priority first."""
+        for priority in Priority:
+            queues = self.waiters[priority]
+            while queues and self._has_capacity(priority):
+                session, queue = next(iter(queues.items()))
+                waiter = queue.popleft()
+                if queue:
+                    queues.move_to_end(session)
+                else:
+                    del queues[session]
+                if not waiter.done():
+                    self.active[priority] += 1
+                    waiter.set_result(None)
+
+    def _release(self, priority: Priority) -> None:
+        """Free a slot and admit the next waiters."""
+        self.active[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[Priority] = None,
+        session: Hashable = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold a request slot for the duration of the context.
+
+        Args:
+            priority: The request's priority, defaults to the current request_priority
+            session: The requesting session, defaults to current_session()
+        """
+        priority = request_priority.get() if priority is None else priority
+        session = current_session() if session is None else session
+        labels = {"priority": priority.name.lower()}
+
+        if self._has_capacity(priority) and not self._has_waiters(priority):
+            self.active[priority] += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters[priority].setdefault(session, deque()).append(waiter)
+            metrics.incr("scheduler_queued", **labels)
+            start = time.perf_counter()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release(priority)
+                else:
+                    self._discard(priority, session, waiter)
+                metrics.incr("scheduler_cancelled", **labels)
+                logger.debug("Scheduled request cancelled while queued", priority=labels["priority"])
+                raise
+            waited = time.perf_counter() - start
+            metrics.observe("scheduler_wait", waited, **labels)
+            add_phase("queue", waited)
+
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def _discard(self, priority: Priority, session: Hashable, waiter: asyncio.Future) -> None:
+        """Remove a cancelled waiter from its session's queue."""
+        queue = self.waiters[priority].get(session)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self.waiters[priority][session]
+
+
+scheduler = RequestScheduler()
+
+
+def get_scheduler(max_concurrency: int, reserved_interactive: int) -> RequestScheduler:
+    """Return the shared scheduler, applying the configured limits."""
+    if (scheduler.max_concurrency, scheduler.reserved_interactive) != (
+        max_concurrency, reserved_interactive
+    ):
+        scheduler.max_concurrency = max_concurrency
+        scheduler.reserved_interactive = reserved_interactive
+        scheduler._dispatch()
+    return scheduler
@@ -1,51 +1,241 @@
 #!/usr/bin/env python
 """Chess.com MCP Server - Provides tools and resources for Chess.com API integration."""
 
+import asyncio
 import os
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import httpx
 import structlog
 from mcp.server.fastmcp import FastMCP
 
+from chess_mcp.cassette import exchange_key, get_cassette
+from chess_mcp.clocks import ClockArrays, ClockCache, clock_arrays, time_management_stats
+from chess_mcp.metrics import metrics
+from chess_mcp.pgn import (
+    analyze_chunk,
+    chunk_bounds,
+    merge_analytics,
+)
+from chess_mcp.pool import map_in_pool, run_in_pool
+from chess_mcp.profiling import HTTPTrace, phase, profiler
+from chess_mcp.resilience import (
+    CircuitOpenError,
+    breakers,
+    endpoint_family,
+    get_breaker,
+    hedged,
+    is_upstream_failure,
+    latencies,
+    stale_cache,
+)
+from chess_mcp.scheduler import bulk_request, get_scheduler
+from chess_mcp.spool import SPOOLED_BODY, SpooledBody, read_response, spool_cache
+from chess_mcp.store import game_key, game_store, is_past_month
+from chess_mcp.timeseries import RESOLUTIONS, bucket_series, lttb
+
 logger = structlog.get_logger(__name__)
 mcp = FastMCP("Chess.com API MCP")
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass
 class ChessConfig:
     """Configuration for Chess.com API client."""
 
     base_url: str = "https://api.chess.com/pub"
+    cassette_mode: Optional[str] = None
+    cassette_path: str = "chess_mcp_cassette.jsonl"
+    replay_latency: bool = False
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    breaker_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    serve_stale: bool = True
+    analytics_workers: Optional[int] = None
+    analytics_chunk_size: int = 500
+    max_response_bytes: int = 16 * 1024 * 1024
+    pgn_page_size: int = 100
+    max_concurrent_requests: int = 4
+    reserved_interactive_requests: int = 1
+    profile_enabled: bool = False
+    profile_dir: str = "chess_mcp_profile"
+    profile_cprofile: bool = False
+    profile_sample_interval: float = 0.005
+
+    def load_from_env(self) -> None:
+        """Override settings from CHESS_MCP_* environment variables."""
+        self.base_url = os.getenv("CHESS_MCP_BASE_URL", self.base_url)
+        self.cassette_mode = os.getenv("CHESS_MCP_CASSETTE_MODE", self.cassette_mode) or None
+        self.cassette_path = os.getenv("CHESS_MCP_CASSETTE_PATH", self.cassette_path)
+        self.replay_latency = _env_flag("CHESS_MCP_REPLAY_LATENCY", self.replay_latency)
+        self.hedge_enabled = _env_flag("CHESS_MCP_HEDGE", self.hedge_enabled)
+        self.hedge_percentile = float(
+            os.getenv("CHESS_MCP_HEDGE_PERCENTILE", self.hedge_percentile)
+        )
+        self.hedge_min_samples = int(
+            os.getenv("CHESS_MCP_HEDGE_MIN_SAMPLES", self.hedge_min_samples)
+        )
+        self.breaker_threshold = int(
+            os.getenv("CHESS_MCP_BREAKER_THRESHOLD", self.breaker_threshold)
+        )
+        self.breaker_reset_timeout = float(
+            os.getenv("CHESS_MCP_BREAKER_RESET_TIMEOUT", self.breaker_reset_timeout)
+        )
+        self.serve_stale = _env_flag("CHESS_MCP_SERVE_STALE", self.serve_stale)
+        workers = os.getenv("CHESS_MCP_ANALYTICS_WORKERS")
+        if workers is not None:
+            self.analytics_workers = int(workers)
+        self.analytics_chunk_size = int(
+            os.getenv("CHESS_MCP_ANALYTICS_CHUNK_SIZE", self.analytics_chunk_size)
+        )
+
+        self.max_response_bytes = int(
+            os.getenv("CHESS_MCP_MAX_RESPONSE_BYTES", self.max_response_bytes)
+        )
+        self.pgn_page_size = int(os.getenv("CHESS_MCP_PGN_PAGE_SIZE", self.pgn_page_size))
+        self.max_concurrent_requests = int(
+            os.getenv("CHESS_MCP_MAX_CONCURRENT_REQUESTS", self.max_concurrent_requests)
+        )
+        self.reserved_interactive_requests = int(
+            os.getenv("CHESS_MCP_RESERVED_INTERACTIVE_REQUESTS", self.reserved_interactive_requests)
+        )
+        self.profile_enabled = _env_flag("CHESS_MCP_PROFILE", self.profile_enabled)
+        self.profile_dir = os.getenv("CHESS_MCP_PROFILE_DIR", self.profile_dir)
+        self.profile_cprofile = _env_flag("CHESS_MCP_PROFILE_CPROFILE", self.profile_cprofile)
+        self.profile_sample_interval = float(
+            os.getenv("CHESS_MCP_PROFILE_SAMPLE_INTERVAL", self.profile_sample_interval)
+        )
+
+        if self.cassette_mode not in (None, "record", "replay"):
+            raise ValueError("CHESS_MCP_CASSETTE_MODE must be 'record' or 'replay'")
 
 
 config = ChessConfig()
+config.load_from_env()
+
+
+async def _get(
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]]
+) -> httpx.Response:
+    """
+    Send a single GET request upstream, streaming the body.
+
+    Bodies larger than config.max_response_bytes are spilled to a temp file
+    instead of being buffered in memory, see read_response(). While profiling,
+    the request is traced to record its connect and TTFB phases.
+    """
+    extensions = {"trace": HTTPTrace()} if profiler.enabled else None
+    async with httpx.AsyncClient() as client:
+        async with client.stream(
+            "GET", url, headers=headers, params=params or {}, extensions=extensions
+        ) as response:
+            with phase("download"):
+                return await read_response(response, config.max_response_bytes)
+
+
+async def _send(
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]],
+    family: str
+) -> httpx.Response:
+    """
+    Send a GET request upstream, or replay/record it through the cassette.
+
+    With hedging enabled, a second copy of the request is sent once the first
+    has been outstanding longer than the family's configured latency percentile.
+    The caller holds the first copy's scheduler slot; the second copy takes
+    a slot of its own at the same priority, so hedging cannot exceed the
+    configured concurrency.
+
+    Args:
+        url: The full request URL
+        headers: Request headers
+        params: Optional query parameters
+        family: The endpoint family, see endpoint_family()
+
+    Returns:
+        The upstream (or replayed) response
+    """
+    if config.cassette_mode == "replay":
+        return await get_cassette(config.cassette_path).replay(
+            url, params, headers,
+            latency=config.replay_latency,
+            max_bytes=config.max_response_bytes
+        )
+
+    delay = None
+    if config.hedge_enabled:
+        delay = latencies.percentile(family, config.hedge_percentile, config.hedge_min_samples)
+
+    async def send_hedge() -> httpx.Response:
+        scheduler = get_scheduler(
+            config.max_concurrent_requests, config.reserved_interactive_requests
+        )
+        async with scheduler.slot():
+            return await _get(url, headers, params)
+
+    start = time.perf_counter()
+    response = await hedged(lambda: _get(url, headers, params), delay, family, hedge=send_hedge)
+    latencies.observe(family, time.perf_counter() - start)
+
+    if config.cassette_mode == "record":
+        get_cassette(config.cassette_path).record(
+            url, params, headers, response, time.perf_counter() - start
+        )
+    return response
 
 
 async def make_api_request(
     endpoint: str,
     params: Optional[Dict[str, Any]] = None,
     accept_json: bool = True
-) -> Union[Dict[str, Any], str]:
+) -> Union[Dict[str, Any], str, SpooledBody]:
     """
     Make a request to the Chess.com API.
 
+    Requests are grouped into endpoint families, each with its own circuit
+    breaker. While a family's circuit is open, requests fail fast or, if
+    enabled, are answered with the last successful result for the same request.
+
+    Upstream requests are admitted by the request scheduler, which serves
+    interactive requests before those made by bulk tools (see bulk_request)
+    and shares capacity fairly between MCP sessions.
+
     Args:
         endpoint: The API endpoint to request
         params: Optional query parameters
         accept_json: Whether to accept JSON response (True) or PGN (False)
 
     Returns:
-        JSON response as dict or text response as string
+        JSON response as dict, or text response as string; text bodies larger
+        than config.max_response_bytes are returned as a SpooledBody instead
 
     Raises:
         httpx.HTTPError: If the request fails
+        CircuitOpenError: If the circuit is open and no stale result is available
     """
     url = f"{config.base_url}/{endpoint}"
     headers = {
         "accept": "application/json" if accept_json else "application/x-chess-pgn"
     }
+    family = endpoint_family(endpoint)
+    stale_key = exchange_key(url, params, headers["accept"])
+    breaker = get_breaker(family, config.breaker_threshold, config.breaker_reset_timeout)
 
     logger.debug(
         "Making API request",
@@ -55,29 +245,66 @@ async def make_api_request(
         has_params=params is not None
     )
 
-    async with httpx.AsyncClient() as client:
+    if config.breaker_threshold > 0 and not breaker.allow():
+        metrics.incr("circuit_rejected", family=family)
+        stale = stale_cache.get(stale_key) if config.serve_stale else None
+        if stale is not None:
+            logger.warning("Circuit open, serving stale result", endpoint=endpoint, family=family)
+            metrics.incr("stale_served", family=family)
+            return stale
+        logger.error("Circuit open, failing fast", endpoint=endpoint, family=family)
+        raise CircuitOpenError(f"Circuit open for {family} requests")
+
+    scheduler = get_scheduler(config.max_concurrent_requests, config.reserved_interactive_requests)
+    try:
+        async with scheduler.slot():
+            response = await _send(url, headers, params, family)
+        spooled = response.extensions.get(SPOOLED_BODY)
         try:
-            response = await client.get(url, headers=headers, params=params or {})
             response.raise_for_status()
+        except httpx.HTTPStatusError:
+            if spooled is not None:
+                spooled.close()
+            raise
 
-            if accept_json:
+        with phase("decode"):
+            if accept_json and spooled is not None:
+                result = spooled.read_json()
+                spooled.close()
+                logger.debug("API request successful", endpoint=endpoint, response_type="json")
+            elif accept_json:
                 result = response.json()
                 logger.debug("API request successful", endpoint=endpoint, response_type="json")
-                return result
+            elif spooled is not None:
+                result = spooled
+                logger.debug("API request successful", endpoint=endpoint, response_type="spooled")
             else:
                 result = response.text
                 logger.debug("API request successful", endpoint=endpoint, response_type="text")
-                return result
-
-        except httpx.HTTPError as e:
-            logger.error(
-                "API request failed",
-                endpoint=endpoint,
-                url=url,
-                error=str(e),
-                error_type=type(e).__name__
-            )
-            raise
+
+        breaker.record_success()
+        if config.serve_stale and not isinstance(result, SpooledBody):
+            size = spooled.size if spooled is not None else len(response.content)
+            stale_cache.put(stale_key, result, size)
+        return result
+
+    except httpx.HTTPError as e:
+        if is_upstream_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        logger.error(
+            "API request failed",
+            endpoint=endpoint,
+            url=url,
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise
+
+    except BaseException:
+        breaker.abandon()
+        raise
 
 
 @mcp.tool(description="Get a player's profile from Chess.com")
@@ -158,13 +385,25 @@ async def get_player_games_by_month(
         Games data for the specified month
     """
     month_str = str(month).zfill(2)
+    if game_store.has_archive(username, year, month):
+        logger.info(
+            "Serving player games by month from game store",
+            username=username,
+            year=year,
+            month=month_str
+        )
+        return {"games": game_store.get_archive(username, year, month)}
+
     logger.info(
         "Fetching player games by month",
         username=username,
         year=year,
         month=month_str
     )
-    return await make_api_request(f"player/{username}/games/{year}/{month_str}")
+    complete = is_past_month(year, month)
+    result = await make_api_request(f"player/{username}/games/{year}/{month_str}")
+    game_store.add_archive(username, year, month, result.get("games", []), complete=complete)
+    return result
 
 
 @mcp.tool(description="Get a list of available monthly game archives for a player on Chess.com")
@@ -182,6 +421,96 @@ async def get_player_game_archives(username: str) -> Dict[str, Any]:
     return await make_api_request(f"player/{username}/games/archives")
 
 
+def _parse_archive_url(archive_url: str) -> Tuple[int, int]:
+    """
+    Extract the year and month from a monthly archive URL.
+
+    Args:
+        archive_url: Archive URL ending in /games/YYYY/MM
+
+    Returns:
+        Tuple of (year, month)
+    """
+    year, month = archive_url.rstrip("/").split("/")[-2:]
+    return int(year), int(month)
+
+
+def _game_outcome(game: Dict[str, Any], username: str) -> str:
+    """
+    Classify a game's result from one player's point of view.
+
+    Args:
+        game: Game data as returned in a Chess.com monthly archive
+        username: The player whose result to report
+
+    Returns:
+        "win", "loss" or "draw"
+    """
+    white = game.get("white", {})
+    black = game.get("black", {})
+    if white.get("username", "").lower() == username.lower():
+        own, other = white, black
+    else:
+        own, other = black, white
+
+    if own.get("result") == "win":
+        return "win"
+    if other.get("result") == "win":
+        return "loss"
+    return "draw"
+
+
+@mcp.tool(description="Get the head-to-head record and games between two players on Chess.com")
+@bulk_request
+async def get_head_to_head(username: str, opponent: str) -> Dict[str, Any]:
+    """
+    Get the head-to-head record and games between two players on Chess.com.
+
+    Only months present in both players' archive lists can contain games
+    between them, and every such game is listed in both archives, so only the
+    first player's archives for those months are loaded into the game store.
+    The games are found by intersecting the two players' store indexes after
+    each month is loaded, since the store may evict older months meanwhile.
+
+    Args:
+        username: The Chess.com username whose record is reported
+        opponent: The opponent's Chess.com username
+
+    Returns:
+        Win/loss/draw record from the first player's perspective and the games
+    """
+    logger.info("Fetching head-to-head record", username=username, opponent=opponent)
+    player_archives = await get_player_game_archives(username)
+    opponent_archives = await get_player_game_archives(opponent)
+
+    common_months = sorted(
+        {_parse_archive_url(url) for url in player_archives.get("archives", [])}
+        & {_parse_archive_url(url) for url in opponent_archives.get("archives", [])}
+    )
+    found: Dict[str, Dict[str, Any]] = {}
+    for year, month in common_months:
+        await get_player_games_by_month(username, year, month)
+        found.update(
+            (game_key(game), game) for game in game_store.games_between(username, opponent)
+        )
+
+    games = sorted(found.values(), key=lambda game: game.get("end_time", 0))
+    outcomes = [_game_outcome(game, username) for game in games]
+    record = {
+        "wins": outcomes.count("win"),
+        "losses": outcomes.count("loss"),
+        "draws": outcomes.count("draw"),
+    }
+
+    return {
+        "username": username,
+        "opponent": opponent,
+        "total_games": len(games),
+        "record": record,
+        "games": games,
+    }
+
+
 @mcp.tool(description="Get a list of titled players from Chess.com")
 async def get_titled_players(title: str) -> Dict[str, Any]:
     """
@@ -251,7 +580,10 @@ async def download_player_games_pgn(
         month: Month (MM format, 01-12)
 
     Returns:
-        Multi-game PGN format text containing all games for the month
+        Multi-game PGN format text containing all games for the month. If the
+        archive is larger than the configured response ceiling, only the first
+        page of games is returned, preceded by a PGN escape line ("%") that
+        points to get_player_games_pgn_page.
     """
     month_str = str(month).zfill(2)
     logger.info(
@@ -260,11 +592,451 @@ async def download_player_games_pgn(
         year=year,
         month=month_str
     )
-    result = await make_api_request(
-        f"player/{username}/games/{year}/{month_str}/pgn",
-        accept_json=False
+    async with _month_pgn(username, year, month) as result:
+        if not isinstance(result, SpooledBody):
+            return result
+        total_games = len(await asyncio.to_thread(result.game_offsets))
+        shown = min(config.pgn_page_size, total_games)
+        logger.warning(
+            "PGN archive exceeds response ceiling, returning first page",
+            username=username,
+            year=year,
+            month=month_str,
+            size=result.size,
+            games=total_games
+        )
+        return (
+            f"% Showing games 1-{shown} of {total_games}; "
+            f"use get_player_games_pgn_page for the remaining games\n"
+            + await asyncio.to_thread(result.read_games, 0, config.pgn_page_size)
+        )
+
+
+@asynccontextmanager
+async def _month_pgn(
+    username: str,
+    year: int,
+    month: int
+) -> AsyncIterator[Union[str, SpooledBody]]:
+    """
+    Fetch a player's monthly PGN archive for the duration of the context.
+
+    Spilled archives of completed months are kept in a small cache so that
+    paging through them does not download them again; archives of the
+    current month can still grow, so they are always fetched. A spilled
+    archive is held by reference until the context exits, so it stays
+    readable even if the cache evicts it meanwhile.
+
+    Args:
+        username: The Chess.com username
+        year: Year (YYYY format)
+        month: Month (1-12)
+
+    Yields:
+        The PGN text, or a SpooledBody for archives above the response ceiling
+    """
+    endpoint = f"player/{username}/games/{year}/{str(month).zfill(2)}/pgn"
+    result = spool_cache.get(endpoint.lower())
+    if result is None:
+        complete = is_past_month(year, month)
+        result = await make_api_request(endpoint, accept_json=False)
+        if complete and isinstance(result, SpooledBody):
+            spool_cache.put(endpoint.lower(), result.acquire())
+    try:
+        yield result
+    finally:
+        if isinstance(result, SpooledBody):
+            result.close()
+
+
+async def _pgn_chunks(pgn: Union[str, SpooledBody], size: int) -> AsyncIterator[str]:
+    """
+    Cut a PGN archive, in memory or spilled, into chunks of games.
+
+    The chunks are yielded as multi-game PGN text and split into games by the
+    pool workers, so no regex work over a whole month runs on the event loop.
+    Chunk boundaries of in-memory archives are found in the pool; spilled
+    archives are read back one chunk at a time in a worker thread, so only
+    the chunks being consumed are held in memory.
+    """
+    if isinstance(pgn, SpooledBody):
+        offsets = await asyncio.to_thread(pgn.game_offsets)
+        for start in range(0, len(offsets), size):
+            yield await asyncio.to_thread(pgn.read_games, start, size)
+    else:
+        for start, end in await run_in_pool(config.analytics_workers, chunk_bounds, pgn, size):
+            yield pgn[start:end]
+
+
+@mcp.tool(description="Get one page of a player's PGN games for a specific month from Chess.com")
+async def get_player_games_pgn_page(
+    username: str,
+    year: int,
+    month: int,
+    page: int = 1,
+    page_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of a player's PGN games for a specific month from Chess.com.
+
+    Large archives stay on disk and only the requested page is read back;
+    smaller ones are indexed by game in the worker pool, off the event loop.
+
+    Args:
+        username: The Chess.com username
+        year: Year (YYYY format)
+        month: Month (MM format, 01-12)
+        page: Page number, starting at 1
+        page_size: Games per page (defaults to the configured PGN page size)
+
+    Returns:
+        The page's PGN text with the page number, total games and total pages
+
+    Raises:
+        ValueError: If the page or page size is not positive
+    """
+    if page_size is None:
+        page_size = config.pgn_page_size
+    if page < 1 or page_size < 1:
+        logger.error("Invalid page requested", page=page, page_size=page_size)
+        raise ValueError("Page and page size must be positive")
+
+    logger.info(
+        "Fetching player games PGN page",
+        username=username,
+        year=year,
+        month=str(month).zfill(2),
+        page=page
+    )
+    start = (page - 1) * page_size
+    async with _month_pgn(username, year, month) as pgn:
+        if isinstance(pgn, SpooledBody):
+            total_games = len(await asyncio.to_thread(pgn.game_offsets))
+            text = await asyncio.to_thread(pgn.read_games, start, page_size)
+        else:
+            bounds = await run_in_pool(config.analytics_workers, chunk_bounds, pgn, 1)
+            total_games = len(bounds)
+            page_bounds = bounds[start:start + page_size]
+            text = pgn[page_bounds[0][0]:page_bounds[-1][1]] if page_bounds else ""
+
+    return {
+        "username": username,
+        "year": year,
+        "month": month,
+        "page": page,
+        "page_size": page_size,
+        "total_games": total_games,
+        "total_pages": -(-total_games // page_size),
+        "pgn": text,
+    }
+
+
+TIME_CLASSES = ["bullet", "blitz", "rapid", "daily"]
+
+
+async def _archive_months(
+    username: str,
+    year: Optional[int] = None,
+    month: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """
+    List the months a player has game archives for.
+
+    Args:
+        username: The Chess.com username
+        year: Only include months of this year, if given
+        month: Only include this month (requires year), if given
+
+    Returns:
+        Sorted (year, month) tuples
+
+    Raises:
+        ValueError: If a month is given without a year
+    """
+    if month is not None and year is None:
+        logger.error("Month provided without year", month=month)
+        raise ValueError("A month can only be given together with a year")
+    if year is not None and month is not None:
+        return [(year, month)]
+
+    archives = await get_player_game_archives(username)
+    months = sorted(_parse_archive_url(url) for url in archives.get("archives", []))
+    if year is not None:
+        months = [(y, m) for y, m in months if y == year]
+    return months
+
+
+@mcp.tool(
+    description="Get move count, clock usage, time-trouble and game-length analytics "
+    "from a player's Chess.com PGN archives"
+)
+@bulk_request
+async def get_player_game_analytics(
+    username: str,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    time_class: Optional[str] = None,
+    time_trouble_seconds: float = 10.0
+) -> Dict[str, Any]:
+    """
+    Compute analytics over a player's games from their monthly PGN archives.
+
+    Parsing movetext and %clk annotations is CPU-bound, so each month's games
+    are split into chunks that are analyzed in a worker process pool while the
+    next month is downloaded. Only a window of chunks is in flight at a time,
+    and the partial results are merged at the end, which keeps the event loop
+    free to serve other tool calls.
+
+    Args:
+        username: The Chess.com username
+        year: Only analyze this year, if given (defaults to the whole history)
+        month: Only analyze this month of the given year, if given
+        time_class: Only include bullet, blitz, rapid or daily games, if given
+        time_trouble_seconds: Clock level below which the player counts as in time trouble
+
+    Returns:
+        Game counts, game-length distribution, average time used per move
+        number and time-trouble frequency
+
+    Raises:
+        ValueError: If the time class is not valid or a month is given without a year
+    """
+    if time_class is not None and time_class not in TIME_CLASSES:
+        error_msg = f"Invalid time class. Must be one of: {', '.join(TIME_CLASSES)}"
+        logger.error("Invalid time class provided", time_class=time_class)
+        raise ValueError(error_msg)
+
+    months = await _archive_months(username, year, month)
+    logger.info(
+        "Computing player game analytics",
+        username=username,
+        months=len(months),
+        time_class=time_class
     )
-    return result
+
+    async def chunks() -> AsyncIterator[Tuple[Any, ...]]:
+        for archive_year, archive_month in months:
+            async with _month_pgn(username, archive_year, archive_month) as pgn:
+                async for chunk in _pgn_chunks(pgn, config.analytics_chunk_size):
+                    yield chunk, username, time_trouble_seconds, time_class
+
+    partials = await map_in_pool(config.analytics_workers, analyze_chunk, chunks())
+    result = merge_analytics(partials)
+    return {"username": username, "months": len(months), **result}
+
+
+_clock_series_cache = ClockCache()
+
+
+async def _month_clock_series(username: str, year: int, month: int) -> Dict[str, ClockArrays]:
+    """
+    Return the clock arrays of a player's games in one month.
+
+    Completed months are cached since their archives no longer change.
+
+    Args:
+        username: The Chess.com username
+        year: Year (YYYY format)
+        month: Month (1-12)
+
+    Returns:
+        Clock arrays per time class
+    """
+    key = (username.lower(), year, month)
+    cached = _clock_series_cache.get(key)
+    if cached is not None:
+        return cached
+
+    complete = is_past_month(year, month)
+    async with _month_pgn(username, year, month) as pgn:
+        chunks = await map_in_pool(
+            config.analytics_workers,
+            clock_arrays,
+            ((chunk, username) async for chunk in _pgn_chunks(pgn, config.analytics_chunk_size))
+        )
+    time_classes = {time_class for chunk in chunks for time_class in chunk}
+    arrays = {
+        time_class: ClockArrays.concatenate(
+            [chunk[time_class] for chunk in chunks if time_class in chunk]
+        )
+        for time_class in time_classes
+    }
+    if complete:
+        _clock_series_cache.put(key, arrays)
+    return arrays
+
+
+@mcp.tool(
+    description="Get clock-usage and time-management statistics for a player's games on Chess.com"
+)
+@bulk_request
+async def get_player_time_management(
+    username: str,
+    time_class: str = "blitz",
+    year: Optional[int] = None,
+    scramble_seconds: float = 10.0,
+    checkpoint_move: int = 20
+) -> Dict[str, Any]:
+    """
+    Get clock-usage and time-management statistics from a player's %clk annotations.
+
+    Each month's clock series are packed into NumPy arrays once, per time
+    class, and the months are concatenated so that the statistics are computed
+    in a handful of vectorized operations.
+
+    Args:
+        username: The Chess.com username
+        time_class: bullet, blitz or rapid
+        year: Only include games from this year, if given (defaults to the whole history)
+        scramble_seconds: Clock level below which a game counts as a time scramble
+        checkpoint_move: Move number at which clock advantage is compared with the result
+
+    Returns:
+        Average time per move by move number, time-scramble rate and clock
+        advantage versus result
+
+    Raises:
+        ValueError: If the time class or checkpoint move is not valid
+    """
+    live_time_classes = [tc for tc in TIME_CLASSES if tc != "daily"]
+    if time_class not in live_time_classes:
+        error_msg = f"Invalid time class. Must be one of: {', '.join(live_time_classes)}"
+        logger.error("Invalid time class provided", time_class=time_class)
+        raise ValueError(error_msg)
+    if checkpoint_move < 1:
+        logger.error("Invalid checkpoint move provided", checkpoint_move=checkpoint_move)
+        raise ValueError("Checkpoint move must be at least 1")
+
+    months = await _archive_months(username, year)
+    logger.info(
+        "Computing player time management",
+        username=username,
+        months=len(months),
+        time_class=time_class
+    )
+
+    parts = []
+    for archive_year, archive_month in months:
+        arrays = await _month_clock_series(username, archive_year, archive_month)
+        if time_class in arrays:
+            parts.append(arrays[time_class])
+
+    stats = time_management_stats(ClockArrays.concatenate(parts), scramble_seconds, checkpoint_move)
+    return {"username": username, "time_class": time_class, "months": len(months), **stats}
+
+
+# Per player and time class: (complete, points) per month, where complete
+# records whether the month had ended when its points were cached.
+_rating_points_cache: Dict[
+    Tuple[str, str], Dict[Tuple[int, int], Tuple[bool, List[Tuple[int, int]]]]
+] = {}
+
+
+def _rating_points(
+    games: List[Dict[str, Any]],
+    username: str,
+    time_class: str
+) -> List[Tuple[int, int]]:
+    """
+    Extract a player's post-game ratings from archive games.
+
+    Args:
+        games: Games from a monthly archive
+        username: The Chess.com username
+        time_class: Only include games of this time class
+
+    Returns:
+        (end_time, rating) pairs, oldest first
+    """
+    points = []
+    for game in games:
+        if game.get("time_class") != time_class or game.get("rules", "chess") != "chess":
+            continue
+        for side in ("white", "black"):
+            player = game.get(side, {})
+            if player.get("username", "").lower() == username.lower() and "rating" in player:
+                points.append((game["end_time"], player["rating"]))
+    return sorted(points)
+
+
+@mcp.tool(
+    description="Get a player's rating history for a time class on Chess.com, "
+    "downsampled to daily, weekly or monthly buckets or to N points"
+)
+@bulk_request
+async def get_rating_history(
+    username: str,
+    time_class: str = "blitz",
+    resolution: str = "week",
+    points: int = 200
+) -> Dict[str, Any]:
+    """
+    Get a player's rating history, downsampled on the server.
+
+    The series is built from the player's monthly game archives. Points are
+    cached per player and time class, so later calls only load months that
+    appeared since, plus months that had not ended yet when they were cached.
+
+    Args:
+        username: The Chess.com username
+        time_class: bullet, blitz, rapid or daily
+        resolution: "day", "week" or "month" buckets, or "lttb" to keep the
+            most significant points
+        points: Number of points to keep with the "lttb" resolution, at least 3;
+            ignored by the bucketed resolutions
+
+    Returns:
+        Rating points; bucketed points also carry the high, low and game count
+
+    Raises:
+        ValueError: If the time class, resolution or number of points is not valid
+    """
+    if time_class not in TIME_CLASSES:
+        error_msg = f"Invalid time class. Must be one of: {', '.join(TIME_CLASSES)}"
+        logger.error("Invalid time class provided", time_class=time_class)
+        raise ValueError(error_msg)
+    if resolution not in RESOLUTIONS:
+        error_msg = f"Invalid resolution. Must be one of: {', '.join(RESOLUTIONS)}"
+        logger.error("Invalid resolution provided", resolution=resolution)
+        raise ValueError(error_msg)
+    if resolution == "lttb" and points < 3:
+        logger.error("Invalid number of points provided", points=points)
+        raise ValueError("Number of points must be at least 3")
+
+    cached = _rating_points_cache.setdefault((username.lower(), time_class), {})
+    months = await _archive_months(username)
+    missing = [key for key in months if key not in cached or not cached[key][0]]
+    logger.info(
+        "Building rating history",
+        username=username,
+        time_class=time_class,
+        months=len(months),
+        months_loaded=len(missing)
+    )
+
+    for year, month in missing:
+        complete = is_past_month(year, month)
+        archive = await get_player_games_by_month(username, year, month)
+        cached[(year, month)] = (
+            complete, _rating_points(archive.get("games", []), username, time_class)
+        )
+
+    series = [point for key in sorted(cached) for point in cached[key][1]]
+    if resolution == "lttb":
+        history = [
+            {"timestamp": timestamp, "rating": rating}
+            for timestamp, rating in lttb(series, points)
+        ]
+    else:
+        history = bucket_series(series, resolution)
+
+    return {
+        "username": username,
+        "time_class": time_class,
+        "resolution": resolution,
+        "games": len(series),
+        "points": history,
+    }
 
 
 @mcp.resource("chess://player/{username}")
@@ -447,5 +1219,25 @@ async def player_games_pgn_resource(username: str, year: str, month: str) -> str
         return f"Error downloading PGN data: {str(e)}"
 
 
+@mcp.resource("chess://server/metrics")
+async def server_metrics_resource() -> str:
+    """
+    Resource that returns the server's internal metrics.
+
+    Returns:
+        JSON-formatted counters, timings and circuit breaker states
+    """
+    import json
+    logger.debug("Fetching server metrics resource")
+    return json.dumps(
+        {
+            "counters": metrics.snapshot(),
+            "timings": metrics.timings_snapshot(),
+            "circuits": {family: breaker.state for family, breaker in sorted(breakers.items())},
+        },
+        indent=2
+    )
+
+
 if __name__ == "__main__":
     mcp.run()
@@ -0,0 +1,247 @@
+"""Memory-bounded handling of large upstream response bodies."""
+
+import codecs
+import json
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterator, List, Optional
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Key under which a spilled body is attached to a response's extensions.
+SPOOLED_BODY = "chess_mcp.spooled_body"
+
+# Bodies are stored decoded, so headers describing the wire encoding would
+# make httpx try to decode them a second time.
+WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+_GAME_START = b"[Event "
+
+
+class SpooledBody:
+    """
+    A response body that exceeded the in-memory ceiling and lives in a temp file.
+
+    PGN bodies can be read page by page through an index of game start
+    offsets, built on first use by scanning the file line by line. Reads are
+    serialized by a lock, so the body may be read from worker threads.
+
+    A body is reference counted: it starts with one reference, acquire()
+    adds one and close() releases one, and the temp file is only closed
+    once the last reference is released.
+    """
+
+    def __init__(self, file: IO[bytes], size: int, encoding: str = "utf-8") -> None:
+        self.file = file
+        self.size = size
+        self.encoding = encoding
+        self._offsets: Optional[List[int]] = None
+        self._lock = threading.Lock()
+        self._references = 1
+
+    def read_text(self) -> str:
+        """Read the whole body into a string."""
+        with self._lock:
+            self.file.seek(0)
+            return self.file.read().decode(self.encoding)
+
+    def iter_text(self, chunk_size: int = 1 << 20) -> Iterator[str]:
+        """
+        Read the body as text, a chunk at a time.
+
+        Args:
+            chunk_size: Bytes read from the file per chunk
+
+        Yields:
+            Decoded chunks, split on character boundaries
+        """
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        position = 0
+        while True:
+            with self._lock:
+                self.file.seek(position)
+                data = self.file.read(chunk_size)
+            position += len(data)
+            text = decoder.decode(data, final=not data)
+            if text:
+                yield text
+            if not data:
+                return
+
+    def read_json(self) -> Any:
+        """Decode the body as JSON straight from the file."""
+        with self._lock:
+            self.file.seek(0)
+            return json.load(self.file)
+
+    def game_offsets(self) -> List[int]:
+        """
+        Return the byte offset at which each PGN game starts.
+
+        Returns:
+            Offsets of the "[Event " header lines, in file order
+        """
+        with self._lock:
+            if self._offsets is None:
+                offsets = []
+                position = 0
+                self.file.seek(0)
+                for line in self.file:
+                    if line.startswith(_GAME_START):
+                        offsets.append(position)
+                    position += len(line)
+                self._offsets = offsets
+            return self._offsets
+
+    @property
+    def game_count(self) -> int:
+        """Number of PGN games in the body."""
+        return len(self.game_offsets())
+
+    def read_games(self, start: int, count: int) -> str:
+        """
+        Read a range of PGN games.
+
+        Args:
+            start: Index of the first game
+            count: Maximum number of games to read
+
+        Returns:
+            The games' PGN text
+        """
+        offsets = self.game_offsets()
+        if start >= len(offsets):
+            return ""
+        end = start + count
+        with self._lock:
+            self.file.seek(offsets[start])
+            if end < len(offsets):
+                return self.file.read(offsets[end] - offsets[start]).decode(self.encoding)
+            return self.file.read().decode(self.encoding)
+
+    def acquire(self) -> "SpooledBody":
+        """Take another reference to the body, to be released with close()."""
+        with self._lock:
+            self._references += 1
+        return self
+
+    def close(self) -> None:
+        """Release a reference, closing and deleting the temp file after the last one."""
+        with self._lock:
+            self._references -= 1
+            if self._references <= 0:
+                self.file.close()
+
+
+async def read_response(response: httpx.Response, max_bytes: int) -> httpx.Response:
+    """
+    Read a streamed response, spilling the body to a temp file past max_bytes.
+
+    Args:
+        response: An open streamed response
+        max_bytes: Largest body kept in memory; 0 or less disables spilling
+
+    Returns:
+        A closed response holding the body in memory, or with an empty body and
+        the SpooledBody attached under extensions[SPOOLED_BODY]
+    """
+    buffered: List[bytes] = []
+    buffered_size = 0
+    file: Optional[IO[bytes]] = None
+    try:
+        async for chunk in response.aiter_bytes():
+            if file is None and (max_bytes <= 0 or buffered_size + len(chunk) <= max_bytes):
+                buffered.append(chunk)
+                buffered_size += len(chunk)
+                continue
+            if file is None:
+                file = tempfile.TemporaryFile()
+                file.writelines(buffered)
+                buffered = []
+            file.write(chunk)
+            buffered_size += len(chunk)
+    except BaseException:
+        if file is not None:
+            file.close()
+        raise
+
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name.lower() not in WIRE_HEADERS
+    }
+    if file is None:
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=b"".join(buffered),
+            request=response.request
+        )
+
+    logger.info(
+        "Response body spilled to disk",
+        url=str(response.request.url),
+        size=buffered_size,
+        max_bytes=max_bytes
+    )
+    spooled = SpooledBody(file, buffered_size, response.encoding or "utf-8")
+    return httpx.Response(
+        response.status_code,
+        headers=headers,
+        request=response.request,
+        extensions={SPOOLED_BODY: spooled}
+    )
+
+
+def iter_response_text(response: httpx.Response) -> Iterator[str]:
+    """Yield a response's body as text, streaming it back from disk if spilled."""
+    spooled = response.extensions.get(SPOOLED_BODY)
+    if spooled is not None:
+        yield from spooled.iter_text()
+    else:
+        yield response.text
+
+
+@dataclass
+class SpoolCache:
+    """
+    Bounded cache of spilled bodies.
+
+    The cache owns the reference of each body put into it and releases it on
+    eviction; get() hands out a new reference, so a body evicted while a
+    caller is still reading it stays open until that caller closes it.
+    """
+
+    max_size: int = 4
+    entries: "OrderedDict[str, SpooledBody]" = field(default_factory=OrderedDict)
+
+    def put(self, key: str, body: SpooledBody) -> None:
+        """Store a body, taking over its reference, and evict the least recently used if full."""
+        previous = self.entries.pop(key, None)
+        if previous is not None and previous is not body:
+            previous.close()
+        self.entries[key] = body
+        while len(self.entries) > self.max_size:
+            _, evicted = self.entries.popitem(last=False)
+            evicted.close()
+
+    def get(self, key: str) -> Optional[SpooledBody]:
+        """Return a new reference to a cached body, marking it as recently used."""
+        body = self.entries.get(key)
+        if body is not None:
+            self.entries.move_to_end(key)
+            body.acquire()
+        return body
+
+    def clear(self) -> None:
+        """Release and drop all cached bodies."""
+        for body in self.entries.values():
+            body.close()
+        self.entries.clear()
+
+
+spool_cache = SpoolCache()
@@ -0,0 +1,202 @@
+"""Deduplicating game store shared by all players' monthly archives."""
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+ArchiveKey = Tuple[str, int, int]
+
+
+def game_key(game: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the identifier a game is stored under.
+
+    Args:
+        game: Game data as returned in a Chess.com monthly archive
+
+    Returns:
+        The game's UUID, falling back to its URL, or None if it has neither
+    """
+    return game.get("uuid") or game.get("url")
+
+
+def is_past_month(year: int, month: int, now: Optional[datetime] = None) -> bool:
+    """
+    Check whether a month is complete, meaning its archive can no longer change.
+
+    Args:
+        year: Year (YYYY format)
+        month: Month (1-12)
+        now: Reference time, defaults to the current UTC time
+
+    Returns:
+        True if the month ended before the reference time
+    """
+    now = now or datetime.now(timezone.utc)
+    return (year, month) < (now.year, now.month)
+
+
+@dataclass
+class GameStore:
+    """
+    Global game store keyed by game UUID.
+
+    Every game appears in both players' monthly archives. The store keeps one
+    copy of each game and lets archives hold references (keys) into it, while a
+    per-player index allows head-to-head lookups by set intersection.
+
+    Archives fetched before their month ended are kept as live archives: their
+    games are indexed, but has_archive() ignores them so they are fetched
+    again. Once the store holds more than max_games games, the least recently
+    used archives are evicted along with the games no other archive references.
+    """
+
+    max_games: int = 50_000
+    games: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    archives: "OrderedDict[ArchiveKey, List[str]]" = field(default_factory=OrderedDict)
+    live_archives: Set[ArchiveKey] = field(default_factory=set)
+    references: Counter = field(default_factory=Counter)
+    player_index: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def add_game(self, game: Dict[str, Any]) -> Optional[str]:
+        """
+        Add a game to the store, reusing the stored copy if already present.
+
+        Args:
+            game: Game data as returned in a Chess.com monthly archive
+
+        Returns:
+            The key the game is stored under, or None if it has no identifier
+        """
+        key = game_key(game)
+        if key is None:
+            return None
+
+        if key not in self.games:
+            self.games[key] = game
+            for side in ("white", "black"):
+                username = (game.get(side) or {}).get("username")
+                if username:
+                    self.player_index.setdefault(username.lower(), set()).add(key)
+        return key
+
+    def add_archive(
+        self,
+        username: str,
+        year: int,
+        month: int,
+        games: List[Dict[str, Any]],
+        complete: bool = True
+    ) -> None:
+        """
+        Store a player's monthly archive as references into the game store.
+
+        Args:
+            username: The Chess.com username the archive belongs to
+            year: Year (YYYY format)
+            month: Month (1-12)
+            games: Games listed in the archive
+            complete: Whether the month had ended when the archive was fetched
+        """
+        archive = (username.lower(), year, month)
+        keys = [key for key in (self.add_game(game) for game in games) if key is not None]
+        self.references.update(keys)
+        previous = self.archives.pop(archive, None)
+        if previous is not None:
+            self._release(previous)
+        self.archives[archive] = keys
+        if complete:
+            self.live_archives.discard(archive)
+        else:
+            self.live_archives.add(archive)
+        self._evict()
+        logger.debug(
+            "Stored monthly archive",
+            username=username,
+            year=year,
+            month=month,
+            complete=complete,
+            games=len(keys),
+            total_games=len(self.games)
+        )
+
+    def _release(self, keys: List[str]) -> None:
+        """Drop an archive's references, removing games no archive refers to."""
+        for key in keys:
+            self.references[key] -= 1
+            if self.references[key] > 0:
+                continue
+            del self.references[key]
+            game = self.games.pop(key, None)
+            for side in ("white", "black"):
+                username = ((game or {}).get(side) or {}).get("username")
+                index = self.player_index.get(username.lower()) if username else None
+                if index is not None:
+                    index.discard(key)
+                    if not index:
+                        del self.player_index[username.lower()]
+
+    def _evict(self) -> None:
+        """Evict least recently used archives until the store is within max_games."""
+        while len(self.games) > self.max_games and len(self.archives) > 1:
+            archive, keys = self.archives.popitem(last=False)
+            self.live_archives.discard(archive)
+            self._release(keys)
+            logger.debug("Evicted monthly archive", archive=archive, total_games=len(self.games))
+
+    def has_archive(self, username: str, year: int, month: int) -> bool:
+        """Check whether a player's monthly archive was stored after its month ended."""
+        archive = (username.lower(), year, month)
+        return archive in self.archives and archive not in self.live_archives
+
+    def get_archive(self, username: str, year: int, month: int) -> List[Dict[str, Any]]:
+        """
+        Return the games of a stored monthly archive.
+
+        Args:
+            username: The Chess.com username
+            year: Year (YYYY format)
+            month: Month (1-12)
+
+        Returns:
+            The archive's games, in their original order
+        """
+        archive = (username.lower(), year, month)
+        if archive not in self.archives:
+            return []
+        self.archives.move_to_end(archive)
+        return [self.games[key] for key in self.archives[archive]]
+
+    def games_between(self, username: str, opponent: str) -> List[Dict[str, Any]]:
+        """
+        Return all stored games between two players, oldest first.
+
+        Args:
+            username: The first player's username
+            opponent: The second player's username
+
+        Returns:
+            Games in which both players took part
+        """
+        keys = (
+            self.player_index.get(username.lower(), set())
+            & self.player_index.get(opponent.lower(), set())
+        )
+        games = [self.games[key] for key in keys]
+        return sorted(games, key=lambda game: game.get("end_time", 0))
+
+    def clear(self) -> None:
+        """Remove all stored games and archives."""
+        self.games.clear()
+        self.archives.clear()
+        self.live_archives.clear()
+        self.references.clear()
+        self.player_index.clear()
+
+
+game_store = GameStore()
@@ -0,0 +1,102 @@
+"""Downsampling of rating time series."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+Point = Tuple[int, int]
+
+RESOLUTIONS = ["day", "week", "month", "lttb"]
+
+
+def bucket_start(timestamp: int, resolution: str) -> int:
+    """
+    Return the start of the UTC day, ISO week or month containing a timestamp.
+
+    Args:
+        timestamp: Unix timestamp in seconds
+        resolution: "day", "week" or "month"
+
+    Returns:
+        Unix timestamp of the bucket start
+    """
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == "week":
+        start -= timedelta(days=start.weekday())
+    elif resolution == "month":
+        start = start.replace(day=1)
+    return int(start.timestamp())
+
+
+def bucket_series(points: Sequence[Point], resolution: str) -> List[Dict[str, Any]]:
+    """
+    Aggregate a time-ordered rating series into calendar buckets.
+
+    Args:
+        points: (timestamp, rating) pairs, oldest first
+        resolution: "day", "week" or "month"
+
+    Returns:
+        One entry per bucket with the closing rating, high, low and game count
+    """
+    buckets: List[Dict[str, Any]] = []
+    for timestamp, rating in points:
+        start = bucket_start(timestamp, resolution)
+        if buckets and buckets[-1]["timestamp"] == start:
+            bucket = buckets[-1]
+            bucket["rating"] = rating
+            bucket["high"] = max(bucket["high"], rating)
+            bucket["low"] = min(bucket["low"], rating)
+            bucket["games"] += 1
+        else:
+            buckets.append({
+                "timestamp": start,
+                "rating": rating,
+                "high": rating,
+                "low": rating,
+                "games": 1,
+            })
+    return buckets
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """
+    Downsample a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    LTTB keeps the first and last points and, from each of threshold - 2
+    equally sized buckets in between, the point forming the largest triangle
+    with the previously kept point and the average of the next bucket. It
+    preserves the visual shape of the series, including peaks and dips.
+
+    Args:
+        points: (timestamp, rating) pairs, oldest first
+        threshold: Number of points to keep
+
+    Returns:
+        The downsampled points
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    kept = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        start = int(i * every) + 1
+        ax, ay = points[kept]
+        best, best_area = start, -1.0
+        for j in range(start, next_start):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        kept = best
+
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,32 @@
+import pytest
+
+from chess_mcp.metrics import metrics
+from chess_mcp.pool import shutdown_pool
+from chess_mcp.profiling import profiler
+from chess_mcp.resilience import breakers, latencies, stale_cache
+from chess_mcp.scheduler import scheduler
+from chess_mcp.server import _clock_series_cache, _rating_points_cache, mcp
+from chess_mcp.spool import spool_cache
+from chess_mcp.store import game_store
+
+
+@pytest.fixture(autouse=True)
+def reset_server_state():
+    yield
+    profiler.stop(mcp)
+    game_store.clear()
+    breakers.clear()
+    latencies.clear()
+    stale_cache.clear()
+    metrics.reset()
+    _clock_series_cache.clear()
+    _rating_points_cache.clear()
+    spool_cache.clear()
+    assert sum(scheduler.active.values()) == 0
+
+
+@pytest.fixture
+def worker_pool():
+    shutdown_pool()
+    yield
+    shutdown_pool()
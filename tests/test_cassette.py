@@ -0,0 +1,116 @@
+import json
+from unittest.mock import patch, MagicMock
+
+import httpx
+import pytest
+
+from chess_mcp.cassette import Cassette, CassetteMissError, exchange_key
+from chess_mcp.server import config, make_api_request
+from chess_mcp.spool import SPOOLED_BODY
+
+
+def mock_client_for(response):
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value.stream = MagicMock()
+    mock_client.__aenter__.return_value.stream.return_value.__aenter__.return_value = response
+    return mock_client
+
+def test_exchange_key_includes_params_and_accept():
+    key = exchange_key("https://example.com/a", {"x": "1"}, "application/json")
+    assert key == "https://example.com/a?x=1 application/json"
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.jsonl")
+    monkeypatch.setattr(config, "cassette_path", path)
+    monkeypatch.setattr(config, "cassette_mode", "record")
+
+    recorded = httpx.Response(
+        200,
+        headers={"content-type": "application/json"},
+        content=b'{"username": "testuser"}',
+        request=httpx.Request("GET", f"{config.base_url}/player/testuser"),
+    )
+    recorded.headers["content-encoding"] = "gzip"
+    with patch("httpx.AsyncClient", return_value=mock_client_for(recorded)):
+        assert await make_api_request("player/testuser") == {"username": "testuser"}
+
+    with open(path) as f:
+        exchange = json.loads(f.readline())
+    assert exchange["status"] == 200
+    assert exchange["request_headers"] == {"accept": "application/json"}
+    assert "content-encoding" not in exchange["headers"]
+
+    monkeypatch.setattr(config, "cassette_mode", "replay")
+    with patch("httpx.AsyncClient", side_effect=AssertionError("network used")):
+        result = await make_api_request("player/testuser")
+
+    assert result == {"username": "testuser"}
+
+@pytest.mark.asyncio
+async def test_record_and_replay_spill_large_bodies(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.jsonl")
+    monkeypatch.setattr(config, "cassette_path", path)
+    monkeypatch.setattr(config, "cassette_mode", "record")
+    monkeypatch.setattr(config, "max_response_bytes", 8)
+    pgn = '[Event "Live Chess"]\n[White "Ø\\"]\n\n1. e4 1-0\n'
+
+    recorded = httpx.Response(
+        200, content=pgn.encode(), request=httpx.Request("GET", f"{config.base_url}/x")
+    )
+    with patch("httpx.AsyncClient", return_value=mock_client_for(recorded)):
+        (await make_api_request("player/testuser/games/2023/11/pgn", accept_json=False)).close()
+
+    with open(path) as f:
+        assert json.loads(f.readline())["body"] == pgn
+
+    monkeypatch.setattr(config, "cassette_mode", "replay")
+    response = await Cassette(path).replay(
+        f"{config.base_url}/player/testuser/games/2023/11/pgn", None,
+        {"accept": "application/x-chess-pgn"}, max_bytes=8
+    )
+
+    body = response.extensions[SPOOLED_BODY]
+    assert body.read_text() == pgn
+    body.close()
+
+@pytest.mark.asyncio
+async def test_replay_serves_repeats_in_order(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    key = exchange_key("https://example.com/a", None, "application/json")
+    path.write_text("".join(
+        json.dumps({"key": key, "url": "https://example.com/a", "status": status,
+                    "headers": {}, "body": body, "elapsed": 0.01}) + "\n"
+        for status, body in [(500, "oops"), (200, "{}")]
+    ))
+    cassette = Cassette(str(path))
+    headers = {"accept": "application/json"}
+
+    statuses = [
+        (await cassette.replay("https://example.com/a", None, headers, latency=True)).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [500, 200, 200]
+
+@pytest.mark.asyncio
+async def test_replay_miss_raises_http_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "cassette_path", str(tmp_path / "empty.jsonl"))
+    monkeypatch.setattr(config, "cassette_mode", "replay")
+
+    with pytest.raises(CassetteMissError):
+        await make_api_request("player/nobody")
+
+    assert issubclass(CassetteMissError, httpx.HTTPError)
+
+def test_config_load_from_env(monkeypatch):
+    cfg = type(config)()
+    monkeypatch.setenv("CHESS_MCP_CASSETTE_MODE", "replay")
+    monkeypatch.setenv("CHESS_MCP_CASSETTE_PATH", "demo.jsonl")
+    monkeypatch.setenv("CHESS_MCP_REPLAY_LATENCY", "true")
+    cfg.load_from_env()
+    assert (cfg.cassette_mode, cfg.cassette_path, cfg.replay_latency) == ("replay", "demo.jsonl", True)
+
+    monkeypatch.setenv("CHESS_MCP_CASSETTE_MODE", "bogus")
+    with pytest.raises(ValueError):
+        cfg.load_from_env()
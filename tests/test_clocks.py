@@ -0,0 +1,85 @@
+import math
+from pathlib import Path
+
+import numpy as np
+
+from chess_mcp.clocks import (
+    ClockArrays, ClockCache, clock_arrays, clock_matrix, time_management_stats
+)
+from chess_mcp.pgn import extract_clock_series, split_games
+
+SAMPLE_PGN = (Path(__file__).parent / "sample_games.pgn").read_text()
+
+
+def game(own, opponent, score, base=180, increment=0):
+    return {"time_class": "blitz", "base": base, "increment": increment,
+            "score": score, "own": own, "opponent": opponent}
+
+def test_extract_clock_series():
+    series = extract_clock_series(split_games(SAMPLE_PGN), "alice")
+    assert [(g["time_class"], g["score"]) for g in series] == [("blitz", 1.0), ("bullet", 0.5)]
+    assert series[0]["own"] == [181.0, 178.0, 160.0, 158.0]
+    assert series[1]["own"] == [59.0, 8.0]
+    assert extract_clock_series(split_games(SAMPLE_PGN), "alice", "bullet")[0]["base"] == 60
+
+def test_extract_clock_series_skips_games_without_own_clocks():
+    pgn = (
+        '[Event "Live Chess"]\n[White "Bob"]\n[Black "Alice"]\n[Result "1-0"]\n'
+        '[TimeControl "180"]\n\n1. e4 {[%clk 0:02:59]} 1-0\n'
+    )
+    assert extract_clock_series([pgn], "alice") == []
+    assert extract_clock_series([pgn], "bob")[0]["own"] == [179.0]
+
+def test_clock_matrix_pads_with_nan():
+    matrix = clock_matrix([[3.0, 2.0, 1.0], [5.0]])
+    assert matrix.shape == (2, 3)
+    assert matrix[0].tolist() == [3.0, 2.0, 1.0]
+    assert matrix[1, 0] == 5.0 and np.isnan(matrix[1, 1:]).all()
+    assert clock_matrix([]).shape == (0, 0)
+
+def test_time_management_stats():
+    games = [
+        game([170, 150, 120], [175, 160, 100], 1.0, increment=2),
+        game([178, 5], [170, 90], 0.0, increment=2),
+        game([160, 140, 130], [150, 140, 135], 0.5, increment=2),
+    ]
+
+    clocks = ClockArrays.concatenate(
+        [ClockArrays.from_series(games[:2]), ClockArrays.from_series(games[2:])]
+    )
+
+    stats = time_management_stats(clocks, scramble_seconds=10, checkpoint_move=2, max_moves=3)
+
+    assert stats["games"] == 3
+    assert stats["average_time_per_move"] == {1: 12.67, 2: 73.0, 3: 22.0}
+    assert all(type(move) is int for move in stats["average_time_per_move"])
+    assert math.isclose(stats["time_scramble_rate"], 0.3333)
+    advantage = stats["clock_advantage"]
+    assert advantage["games"] == 3
+    assert advantage["average_advantage_by_result"] == {"win": -10.0, "draw": 0.0, "loss": -85.0}
+    assert advantage["score_when_ahead"] is None
+    assert advantage["score_when_behind"] == 0.5
+
+def test_time_management_stats_short_games_and_empty():
+    clocks = ClockArrays.from_series([game([170], [175], 1.0)])
+    stats = time_management_stats(clocks, checkpoint_move=20)
+    assert stats["clock_advantage"] is None
+    assert time_management_stats(ClockArrays.concatenate([]))["time_scramble_rate"] is None
+
+def test_clock_arrays_groups_by_time_class():
+    arrays = clock_arrays(SAMPLE_PGN, "alice")
+    assert sorted(arrays) == ["blitz", "bullet"]
+    assert arrays["blitz"].own[0].tolist() == [181.0, 178.0, 160.0, 158.0]
+    assert arrays["bullet"].base.tolist() == [60.0]
+
+def test_clock_cache_evicts_least_recently_used_months():
+    cache = ClockCache(max_games=2)
+    month = {"blitz": ClockArrays.from_series([game([170], [175], 1.0)])}
+    cache.put(("alice", 2023, 1), month)
+    cache.put(("alice", 2023, 2), month)
+    assert cache.get(("alice", 2023, 1)) is month
+
+    cache.put(("alice", 2023, 3), month)
+
+    assert list(cache.entries) == [("alice", 2023, 1), ("alice", 2023, 3)]
+    assert cache.total_games == 2
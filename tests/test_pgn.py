@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from chess_mcp.pgn import (
+    analyze_chunk, chunk_bounds, count_plies, merge_analytics, parse_clocks,
+    parse_game, parse_time_control, split_games, time_class,
+)
+
+SAMPLE_PGN = (Path(__file__).parent / "sample_games.pgn").read_text()
+
+
+def test_split_and_chunk_games():
+    games = split_games(SAMPLE_PGN)
+    assert len(games) == 3
+    assert all(game.startswith("[Event ") for game in games)
+    bounds = chunk_bounds(SAMPLE_PGN, 2)
+    assert [len(split_games(SAMPLE_PGN[start:end])) for start, end in bounds] == [2, 1]
+    assert bounds[-1][1] == len(SAMPLE_PGN)
+    assert split_games("") == []
+
+def test_parse_game():
+    headers, movetext = parse_game(split_games(SAMPLE_PGN)[0])
+    assert headers["White"] == "Alice"
+    assert headers["TimeControl"] == "180+2"
+    assert movetext.startswith("1. e4")
+    assert count_plies(movetext) == 7
+    assert parse_clocks(movetext)[:2] == [181.0, 180.0]
+
+def test_parse_clocks_fractional_and_hours():
+    assert parse_clocks("1. e4 {[%clk 1:00:00.5]}") == [3600.5]
+
+def test_time_control_and_class():
+    assert parse_time_control("180+2") == (180, 2)
+    assert parse_time_control("600") == (600, 0)
+    assert parse_time_control("1/86400") is None
+    assert time_class("60") == "bullet"
+    assert time_class("120+1") == "bullet"
+    assert time_class("180+2") == "blitz"
+    assert time_class("600") == "rapid"
+    assert time_class("1/259200") == "daily"
+
+def test_analyze_chunk_and_merge():
+    games = split_games(SAMPLE_PGN)
+    partials = [analyze_chunk(games[:1], "alice"), analyze_chunk(games[1:], "ALICE")]
+
+    result = merge_analytics(partials)
+
+    assert result["games"] == 3
+    assert result["average_moves"] == 2.67
+    assert result["game_length_distribution"] == {"0-9": 3}
+    assert result["games_with_clock"] == 2
+    assert result["time_trouble_rate"] == 0.5
+    # Move 1: (180 - 181 + 2) for the blitz game, (60 - 59) for the bullet game
+    assert result["average_time_per_move"][1] == 1.0
+
+def test_analyze_chunk_splits_pgn_text():
+    assert analyze_chunk(SAMPLE_PGN, "alice") == analyze_chunk(split_games(SAMPLE_PGN), "alice")
+
+def test_analyze_chunk_filters_time_class():
+    result = merge_analytics([analyze_chunk(split_games(SAMPLE_PGN), "alice", game_time_class="daily")])
+    assert result["games"] == 1
+    assert result["time_trouble_rate"] is None
+    assert result["average_time_per_move"] == {}
+
+def test_merge_analytics_empty():
+    assert merge_analytics([])["average_moves"] is None
@@ -0,0 +1,31 @@
+import pytest
+
+from chess_mcp.pool import map_in_pool
+
+
+@pytest.mark.asyncio
+async def test_map_in_pool_keeps_order_and_bounds_work_in_flight(worker_pool):
+    finished = []
+
+    def square(x):
+        finished.append(x)
+        return x * x
+
+    async def args():
+        for i in range(10):
+            assert i - len(finished) <= 2
+            yield (i,)
+
+    results = await map_in_pool(0, square, args(), window=2)
+
+    assert results == [i * i for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_map_in_pool_propagates_errors(worker_pool):
+    async def args():
+        yield (1,)
+        yield (0,)
+
+    with pytest.raises(ZeroDivisionError):
+        await map_in_pool(0, lambda x: 1 / x, args())
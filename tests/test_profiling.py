@@ -0,0 +1,205 @@
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+from chess_mcp.profiling import (
+    HTTPTrace, ProfiledTool, Profiler, StackSampler, add_phase, current_phases, phase, profiler
+)
+from chess_mcp.main import _on_profiling_signal
+from chess_mcp.server import config, mcp
+
+
+def mock_stream_client(content=b""):
+    """Mock httpx.AsyncClient whose stream() yields a response with the given body."""
+    mock_response = httpx.Response(
+        200, content=content, request=httpx.Request("GET", "https://api.chess.com/pub")
+    )
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value.stream = MagicMock()
+    mock_client.__aenter__.return_value.stream.return_value.__aenter__.return_value = mock_response
+    return mock_client
+
+
+def read_timings(path):
+    return [json.loads(line) for line in (path / "timings.jsonl").read_text().splitlines()]
+
+
+def test_phase_is_noop_outside_profiled_call():
+    with phase("decode") as timed:
+        pass
+    add_phase("decode", 1.0)
+
+    assert timed is None
+    assert current_phases.get() is None
+
+
+def test_phase_accumulates_inside_profiled_call():
+    phases = {}
+    token = current_phases.set(phases)
+    try:
+        with phase("decode"):
+            pass
+        add_phase("decode", 1.0)
+    finally:
+        current_phases.reset(token)
+
+    assert phases["decode"] >= 1.0
+
+
+def test_start_wraps_tools_and_stop_restores_them(tmp_path):
+    original = mcp._tool_manager.get_tool("get_player_profile")
+
+    profiler.start(mcp, output_dir=str(tmp_path), sample_interval=0)
+    assert profiler.enabled
+    profiled = mcp._tool_manager.get_tool("get_player_profile")
+    assert isinstance(profiled, ProfiledTool)
+    assert profiled.fn is original.fn
+
+    profiler.stop(mcp)
+    assert not profiler.enabled
+    assert mcp._tool_manager.get_tool("get_player_profile") is original
+
+
+@pytest.mark.asyncio
+async def test_profiled_tool_call_writes_phase_timings(tmp_path):
+    mock_client = mock_stream_client(content=b'{"username": "testuser"}')
+
+    profiler.start(mcp, output_dir=str(tmp_path), sample_interval=0)
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        await mcp.call_tool("get_player_profile", {"username": "testuser"})
+    profiler.stop(mcp)
+
+    [entry] = read_timings(tmp_path)
+    assert entry["tool"] == "get_player_profile"
+    assert {"download", "decode", "serialize", "total"} <= set(entry["phases"])
+    extensions = mock_client.__aenter__.return_value.stream.call_args.kwargs["extensions"]
+    assert isinstance(extensions["trace"], HTTPTrace)
+
+
+@pytest.mark.asyncio
+async def test_profiled_tool_errors_are_recorded(tmp_path):
+    mock_client = mock_stream_client(content=b"not json")
+
+    profiler.start(mcp, output_dir=str(tmp_path), sample_interval=0)
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        with pytest.raises(ToolError):
+            await mcp.call_tool("get_player_profile", {"username": "testuser"})
+    profiler.stop(mcp)
+
+    [entry] = read_timings(tmp_path)
+    assert "serialize" not in entry["phases"]
+    assert "total" in entry["phases"]
+
+
+@pytest.mark.asyncio
+async def test_unprofiled_request_is_not_traced(tmp_path):
+    mock_client = mock_stream_client(content=b'{"username": "testuser"}')
+
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        await mcp.call_tool("get_player_profile", {"username": "testuser"})
+
+    assert mock_client.__aenter__.return_value.stream.call_args.kwargs["extensions"] is None
+
+
+@pytest.mark.asyncio
+async def test_http_trace_records_connect_and_ttfb():
+    phases = {}
+    token = current_phases.set(phases)
+    trace = HTTPTrace()
+    try:
+        for event in (
+            "connection.connect_tcp.started",
+            "connection.connect_tcp.complete",
+            "connection.start_tls.started",
+            "connection.start_tls.complete",
+            "http11.send_request_headers.started",
+            "http11.send_request_headers.complete",
+            "http11.receive_response_headers.started",
+            "http11.receive_response_headers.complete",
+        ):
+            await trace(event, {})
+    finally:
+        current_phases.reset(token)
+
+    assert set(phases) == {"connect", "ttfb"}
+
+
+@pytest.mark.asyncio
+async def test_cprofile_capture_dumps_stats(tmp_path):
+    mock_client = mock_stream_client(content=b'{"username": "testuser"}')
+
+    profiler.start(mcp, output_dir=str(tmp_path), cprofile=True, sample_interval=0)
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        await mcp.call_tool("get_player_profile", {"username": "testuser"})
+    profiler.stop(mcp)
+
+    assert len(list(tmp_path.glob("get_player_profile-*.prof"))) == 1
+
+
+def test_stack_sampler_writes_collapsed_stacks(tmp_path):
+    done = threading.Event()
+
+    def busy_loop():
+        while not done.is_set():
+            pass
+
+    thread = threading.Thread(target=busy_loop)
+    thread.start()
+    sampler = StackSampler(thread.ident, 0.001)
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+    done.set()
+    thread.join()
+
+    path = tmp_path / "stacks.collapsed"
+    sampler.write(str(path))
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "busy_loop (test_profiling.py:" in stack
+    assert int(count) > 0
+
+
+def test_stop_writes_collapsed_stacks(tmp_path):
+    local = Profiler()
+    local.start(mcp, output_dir=str(tmp_path), sample_interval=0.001)
+    time.sleep(0.02)
+    local.stop(mcp)
+
+    assert (tmp_path / "stacks.collapsed").exists()
+
+
+def test_profile_config_from_env(monkeypatch):
+    monkeypatch.setenv("CHESS_MCP_PROFILE", "1")
+    monkeypatch.setenv("CHESS_MCP_PROFILE_DIR", "/tmp/profile")
+    monkeypatch.setenv("CHESS_MCP_PROFILE_CPROFILE", "true")
+    monkeypatch.setenv("CHESS_MCP_PROFILE_SAMPLE_INTERVAL", "0.01")
+    monkeypatch.setattr(config, "profile_enabled", False)
+    monkeypatch.setattr(config, "profile_dir", "chess_mcp_profile")
+    monkeypatch.setattr(config, "profile_cprofile", False)
+    monkeypatch.setattr(config, "profile_sample_interval", 0.005)
+
+    config.load_from_env()
+
+    assert config.profile_enabled
+    assert config.profile_dir == "/tmp/profile"
+    assert config.profile_cprofile
+    assert config.profile_sample_interval == 0.01
+
+
+@pytest.mark.asyncio
+async def test_profiling_signal_toggles_on_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(config, "profile_sample_interval", 0)
+
+    _on_profiling_signal()
+    assert not profiler.enabled
+    await asyncio.sleep(0)
+    assert profiler.enabled
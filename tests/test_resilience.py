@@ -0,0 +1,235 @@
+import asyncio
+import json
+import tempfile
+from unittest.mock import patch, MagicMock
+
+import httpx
+import pytest
+
+from chess_mcp.metrics import metrics
+from chess_mcp.resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, StaleCache, endpoint_family, hedged,
+    is_upstream_failure, latencies, stale_cache,
+)
+from chess_mcp.scheduler import scheduler
+from chess_mcp.server import config, make_api_request, server_metrics_resource
+from chess_mcp.spool import SPOOLED_BODY, SpooledBody
+
+
+def response(status, content=b""):
+    return httpx.Response(status, content=content, request=httpx.Request("GET", "https://example.com"))
+
+def status_error(status):
+    error_response = response(status)
+    return httpx.HTTPStatusError("error", request=error_response.request, response=error_response)
+
+def mock_client_for(response):
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value.stream = MagicMock()
+    mock_client.__aenter__.return_value.stream.return_value.__aenter__.return_value = response
+    return mock_client
+
+def test_stale_cache_is_bounded_by_bytes():
+    cache = StaleCache(max_bytes=10, max_entry_bytes=6)
+    cache.put("a", {"a": 1}, 4)
+    cache.put("b", {"b": 1}, 4)
+    cache.put("c", {"c": 1}, 4)
+    cache.put("huge", {"huge": 1}, 7)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == {"b": 1} and cache.get("c") == {"c": 1}
+    assert cache.get("huge") is None
+    assert cache.total_bytes == 8
+
+    cache.put("b", {"b": 2}, 7)
+    assert cache.get("b") is None
+    assert cache.total_bytes == 4
+
+@pytest.mark.asyncio
+async def test_stale_cache_sizes_spilled_json_by_body(monkeypatch):
+    monkeypatch.setattr(config, "max_response_bytes", 16)
+    body = json.dumps({"games": [{"uuid": str(i)} for i in range(20)]}).encode()
+
+    with patch("httpx.AsyncClient", return_value=mock_client_for(response(200, body))):
+        await make_api_request("player/alice/games/2023/11")
+
+    [(_, size)] = stale_cache.entries.values()
+    assert size == len(body)
+
+    monkeypatch.setattr(stale_cache, "max_entry_bytes", len(body) - 1)
+    with patch("httpx.AsyncClient", return_value=mock_client_for(response(200, body))):
+        await make_api_request("player/alice/games/2023/11")
+
+    assert stale_cache.entries == {}
+
+def test_endpoint_family():
+    assert endpoint_family("player/hikaru") == "player"
+    assert endpoint_family("player/hikaru/stats") == "player/stats"
+    assert endpoint_family("player/hikaru/games/2024/01/pgn") == "player/games/pgn"
+    assert endpoint_family("titled/GM") == "titled"
+    assert endpoint_family("club/some-club/members") == "club/members"
+
+def test_is_upstream_failure():
+    assert is_upstream_failure(status_error(503)) is True
+    assert is_upstream_failure(status_error(429)) is True
+    assert is_upstream_failure(status_error(404)) is False
+    assert is_upstream_failure(httpx.ConnectError("down")) is True
+    assert is_upstream_failure(CircuitOpenError("open")) is False
+
+def test_latency_percentile():
+    tracker = LatencyTracker(window=10)
+    for i in range(1, 21):
+        tracker.observe("player", i / 10)
+    assert tracker.percentile("player", 50, min_samples=5) == 1.6
+    assert tracker.percentile("player", 100, min_samples=5) == 2.0
+    assert tracker.percentile("player", 50, min_samples=11) is None
+    assert tracker.percentile("club", 50, min_samples=1) is None
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker("player", failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert metrics.snapshot()["circuit_opened"] == {"family=player": 1}
+
+def test_circuit_breaker_stays_open_until_timeout():
+    breaker = CircuitBreaker("player", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+@pytest.mark.asyncio
+async def test_hedged_backup_wins_when_primary_is_slow():
+    calls = []
+
+    async def send():
+        calls.append(len(calls))
+        await asyncio.sleep(1 if len(calls) == 1 else 0)
+        return len(calls)
+
+    assert await hedged(send, 0.01, "player") == 2
+    assert metrics.snapshot()["hedge_won"] == {"family=player": 1}
+
+@pytest.mark.asyncio
+async def test_hedged_fast_primary_is_not_hedged():
+    async def send():
+        return "ok"
+
+    assert await hedged(send, 1, "player") == "ok"
+    assert "hedge_sent" not in metrics.snapshot()
+
+@pytest.mark.asyncio
+async def test_hedged_uses_backup_when_primary_fails():
+    calls = []
+
+    async def send():
+        calls.append(None)
+        if len(calls) == 1:
+            await asyncio.sleep(0.02)
+            raise httpx.ConnectError("primary failed")
+        await asyncio.sleep(0.05)
+        return "backup"
+
+    assert await hedged(send, 0.01, "player") == "backup"
+
+@pytest.mark.asyncio
+async def test_hedged_raises_when_both_fail():
+    async def send():
+        await asyncio.sleep(0.02)
+        raise httpx.ConnectError("failed")
+
+    with pytest.raises(httpx.ConnectError):
+        await hedged(send, 0.01, "player")
+
+def spooled_response():
+    body = SpooledBody(tempfile.TemporaryFile(), 0)
+    return httpx.Response(200, extensions={SPOOLED_BODY: body}), body
+
+@pytest.mark.asyncio
+async def test_hedged_closes_losing_spooled_body_finished_in_same_round():
+    released = asyncio.Event()
+    (first, first_body), (second, second_body) = spooled_response(), spooled_response()
+
+    async def send():
+        await released.wait()
+        return first
+
+    async def hedge():
+        released.set()
+        return second
+
+    assert await hedged(send, 0.01, "player", hedge=hedge) is first
+    assert not first_body.file.closed
+    assert second_body.file.closed
+    first_body.close()
+
+@pytest.mark.asyncio
+async def test_make_api_request_hedge_takes_its_own_slot(monkeypatch):
+    monkeypatch.setattr(config, "hedge_enabled", True)
+    monkeypatch.setattr(config, "hedge_min_samples", 1)
+    latencies.observe("player", 0.01)
+    active = []
+
+    async def get(url, headers, params):
+        active.append(sum(scheduler.active.values()))
+        await asyncio.sleep(0.05 if len(active) == 1 else 0)
+        return response(200, b"{}")
+
+    with patch("chess_mcp.server._get", side_effect=get):
+        assert await make_api_request("player/testuser") == {}
+
+    assert active == [1, 2]
+    assert sum(scheduler.active.values()) == 0
+
+@pytest.mark.asyncio
+async def test_make_api_request_hedges_past_percentile(monkeypatch):
+    monkeypatch.setattr(config, "hedge_enabled", True)
+    monkeypatch.setattr(config, "hedge_min_samples", 1)
+    latencies.observe("player", 0.5)
+
+    with patch("chess_mcp.server.hedged", side_effect=hedged) as mock_hedged, \
+         patch("httpx.AsyncClient", return_value=mock_client_for(response(200, b"{}"))):
+        await make_api_request("player/testuser")
+
+    assert mock_hedged.call_args[0][1] == 0.5
+
+@pytest.mark.asyncio
+async def test_make_api_request_circuit_serves_stale_then_fails_fast(monkeypatch):
+    monkeypatch.setattr(config, "breaker_threshold", 2)
+    ok = response(200, b'{"username": "testuser"}')
+    failing = response(503)
+
+    with patch("httpx.AsyncClient", return_value=mock_client_for(ok)):
+        await make_api_request("player/testuser")
+
+    with patch("httpx.AsyncClient", return_value=mock_client_for(failing)) as mock_client:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await make_api_request("player/testuser")
+
+        assert await make_api_request("player/testuser") == {"username": "testuser"}
+        with pytest.raises(CircuitOpenError):
+            await make_api_request("player/otheruser")
+        assert mock_client.call_count == 2
+
+    snapshot = json.loads(await server_metrics_resource())
+    assert snapshot["circuits"] == {"player": "open"}
+    assert snapshot["counters"]["stale_served"] == {"family=player": 1}
+    assert snapshot["counters"]["circuit_rejected"] == {"family=player": 2}
+
+@pytest.mark.asyncio
+async def test_make_api_request_client_errors_keep_circuit_closed(monkeypatch):
+    monkeypatch.setattr(config, "breaker_threshold", 1)
+    not_found = response(404)
+
+    with patch("httpx.AsyncClient", return_value=mock_client_for(not_found)):
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await make_api_request("player/nobody")
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from chess_mcp.metrics import metrics
+from chess_mcp.scheduler import (
+    Priority, RequestScheduler, bulk_request, current_session, request_priority,
+)
+
+
+async def hold(scheduler, log, name, release, priority=None, session="a"):
+    async with scheduler.slot(priority, session):
+        log.append(name)
+        await release.wait()
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+@pytest.mark.asyncio
+async def test_interactive_served_before_queued_bulk():
+    scheduler = RequestScheduler(max_concurrency=2, reserved_interactive=1)
+    release, log = asyncio.Event(), []
+    tasks = [asyncio.ensure_future(hold(scheduler, log, f"bulk{i}", release, Priority.BULK))
+             for i in range(3)]
+    await settle()
+    assert log == ["bulk0"]
+
+    tasks.append(asyncio.ensure_future(hold(scheduler, log, "interactive", release, Priority.INTERACTIVE)))
+    await settle()
+    assert log == ["bulk0", "interactive"]
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert log[2:] == ["bulk1", "bulk2"]
+    assert scheduler.active == {Priority.INTERACTIVE: 0, Priority.BULK: 0}
+    assert metrics.snapshot()["scheduler_queued"] == {"priority=bulk": 2}
+
+@pytest.mark.asyncio
+async def test_queued_interactive_admitted_before_queued_bulk():
+    scheduler = RequestScheduler(max_concurrency=1, reserved_interactive=0)
+    gate, release, log = asyncio.Event(), asyncio.Event(), []
+    first = asyncio.ensure_future(hold(scheduler, log, "first", gate, Priority.INTERACTIVE))
+    await settle()
+    tasks = [
+        asyncio.ensure_future(hold(scheduler, log, "bulk", release, Priority.BULK)),
+        asyncio.ensure_future(hold(scheduler, log, "interactive", release, Priority.INTERACTIVE)),
+    ]
+    await settle()
+    gate.set()
+    release.set()
+    await asyncio.gather(first, *tasks)
+    assert log == ["first", "interactive", "bulk"]
+
+@pytest.mark.asyncio
+async def test_sessions_share_bulk_capacity_round_robin():
+    scheduler = RequestScheduler(max_concurrency=1, reserved_interactive=0)
+    gate, release, log = asyncio.Event(), asyncio.Event(), []
+    first = asyncio.ensure_future(hold(scheduler, log, "first", gate, Priority.BULK, "a"))
+    await settle()
+    tasks = [asyncio.ensure_future(hold(scheduler, log, f"a{i}", release, Priority.BULK, "a"))
+             for i in range(3)]
+    tasks.append(asyncio.ensure_future(hold(scheduler, log, "b0", release, Priority.BULK, "b")))
+    await settle()
+    gate.set()
+    release.set()
+    await asyncio.gather(first, *tasks)
+    assert log == ["first", "a0", "b0", "a1", "a2"]
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    scheduler = RequestScheduler(max_concurrency=1, reserved_interactive=0)
+    gate, log = asyncio.Event(), []
+    first = asyncio.ensure_future(hold(scheduler, log, "first", gate))
+    await settle()
+    abandoned = asyncio.ensure_future(hold(scheduler, log, "abandoned", gate))
+    await settle()
+
+    abandoned.cancel()
+    await settle()
+    assert scheduler.waiters[Priority.INTERACTIVE] == {}
+
+    gate.set()
+    await first
+    assert log == ["first"]
+    assert scheduler.active[Priority.INTERACTIVE] == 0
+    assert metrics.snapshot()["scheduler_cancelled"] == {"priority=interactive": 1}
+
+@pytest.mark.asyncio
+async def test_bulk_request_sets_priority():
+    @bulk_request
+    async def tool(value: int) -> Priority:
+        return request_priority.get()
+
+    assert await tool(1) == Priority.BULK
+    assert request_priority.get() == Priority.INTERACTIVE
+    assert tool.__name__ == "tool"
+
+def test_current_session_outside_request():
+    assert current_session() is None
@@ -3,49 +3,76 @@ from unittest.mock import patch, MagicMock, AsyncMock
 import json
 import os
 import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
 
 from chess_mcp.server import (
     make_api_request, config,
     get_player_profile, get_player_stats, is_player_online,
     get_player_current_games, get_player_games_by_month, get_player_game_archives,
     get_titled_players, get_club_profile, get_club_members, download_player_games_pgn,
+    get_head_to_head, get_player_game_analytics, get_player_time_management,
+    get_rating_history, get_player_games_pgn_page,
     player_profile_resource, player_stats_resource,
     player_current_games_resource, player_games_by_month_resource,
     titled_players_resource, club_profile_resource, player_games_pgn_resource
 )
 from chess_mcp.main import setup_environment, run_server
+from chess_mcp.spool import SpooledBody, spool_cache
 
-@pytest.mark.asyncio
-async def test_make_api_request():
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"data": "test_data"}
-    mock_response.raise_for_status = MagicMock()
+SAMPLE_PGN = (Path(__file__).parent / "sample_games.pgn").read_text()
 
+def mock_stream_client(status=200, content=b""):
+    """Mock httpx.AsyncClient whose stream() yields a response with the given body."""
+    mock_response = httpx.Response(
+        status, content=content, request=httpx.Request("GET", "https://api.chess.com/pub")
+    )
     mock_client = MagicMock()
-    mock_client.__aenter__.return_value.get.return_value = mock_response
+    mock_client.__aenter__.return_value.stream = MagicMock()
+    mock_client.__aenter__.return_value.stream.return_value.__aenter__.return_value = mock_response
+    return mock_client
+
+@pytest.mark.asyncio
+async def test_make_api_request():
+    mock_client = mock_stream_client(content=b'{"data": "test_data"}')
 
     with patch("httpx.AsyncClient", return_value=mock_client):
         result = await make_api_request("endpoint/test")
 
     assert result == {"data": "test_data"}
-    mock_client.__aenter__.return_value.get.assert_called_once()
-    url_called = mock_client.__aenter__.return_value.get.call_args[0][0]
+    mock_client.__aenter__.return_value.stream.assert_called_once()
+    method, url_called = mock_client.__aenter__.return_value.stream.call_args[0]
+    assert method == "GET"
     assert url_called == f"{config.base_url}/endpoint/test"
 
 @pytest.mark.asyncio
 async def test_make_api_request_http_error():
     """Test that HTTP errors are properly logged and re-raised."""
-    import httpx
-    mock_response = MagicMock()
-    mock_response.raise_for_status.side_effect = httpx.HTTPError("Test error")
-
-    mock_client = MagicMock()
-    mock_client.__aenter__.return_value.get.return_value = mock_response
+    mock_client = mock_stream_client(status=500)
 
     with patch("httpx.AsyncClient", return_value=mock_client):
         with pytest.raises(httpx.HTTPError):
             await make_api_request("endpoint/test")
 
+@pytest.mark.asyncio
+async def test_make_api_request_spills_large_bodies(monkeypatch):
+    monkeypatch.setattr(config, "max_response_bytes", 16)
+    json_client = mock_stream_client(content=b'{"games": ["' + b"x" * 100 + b'"]}')
+    pgn_client = mock_stream_client(content=SAMPLE_PGN.encode())
+
+    with patch("httpx.AsyncClient", return_value=json_client):
+        assert await make_api_request("endpoint/test") == {"games": ["x" * 100]}
+
+    with patch("httpx.AsyncClient", return_value=pgn_client):
+        result = await make_api_request("endpoint/test", accept_json=False)
+
+    assert isinstance(result, SpooledBody)
+    assert result.game_count == 3
+    assert result.read_text() == SAMPLE_PGN
+    result.close()
+
 @pytest.mark.asyncio
 async def test_get_player_profile():
     mock_data = {"username": "testuser", "avatar": "test_url", "status": "active"}
@@ -86,6 +113,233 @@ async def test_get_player_games_by_month():
 
     assert result == mock_data
 
+@pytest.mark.asyncio
+async def test_get_player_games_by_month_served_from_store():
+    mock_data = {"games": [{"uuid": "g1", "url": "game_url", "pgn": "pgn_data"}]}
+    mock_request = AsyncMock(return_value=mock_data)
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        await get_player_games_by_month("testuser", 2023, 12)
+        result = await get_player_games_by_month("TestUser", 2023, 12)
+
+    assert result == mock_data
+    mock_request.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_player_games_by_month_current_month_refetched():
+    mock_request = AsyncMock(return_value={"games": []})
+    with patch("chess_mcp.server.make_api_request", new=mock_request), \
+         patch("chess_mcp.server.is_past_month", return_value=False):
+        await get_player_games_by_month("testuser", 2023, 12)
+        await get_player_games_by_month("testuser", 2023, 12)
+
+    assert mock_request.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_player_games_by_month_refetched_after_month_ends():
+    mock_request = AsyncMock(side_effect=[
+        {"games": [{"uuid": "g1"}]},
+        {"games": [{"uuid": "g1"}, {"uuid": "g2"}]},
+    ])
+    with patch("chess_mcp.server.make_api_request", new=mock_request), \
+         patch("chess_mcp.store.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2026, 10, 15, tzinfo=timezone.utc)
+        await get_player_games_by_month("testuser", 2026, 10)
+        mock_datetime.now.return_value = datetime(2026, 11, 2, tzinfo=timezone.utc)
+        result = await get_player_games_by_month("testuser", 2026, 10)
+        cached = await get_player_games_by_month("testuser", 2026, 10)
+
+    assert len(result["games"]) == 2
+    assert cached == {"games": result["games"]}
+    assert mock_request.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_head_to_head():
+    def game(uuid, white, black, white_result, black_result, end_time):
+        return {
+            "uuid": uuid, "end_time": end_time,
+            "white": {"username": white, "result": white_result},
+            "black": {"username": black, "result": black_result},
+        }
+
+    responses = {
+        "player/alice/games/archives": {"archives": [
+            "https://api.chess.com/pub/player/alice/games/2023/11",
+            "https://api.chess.com/pub/player/alice/games/2023/12",
+        ]},
+        "player/bob/games/archives": {"archives": [
+            "https://api.chess.com/pub/player/bob/games/2023/12",
+        ]},
+        "player/alice/games/2023/12": {"games": [
+            game("g1", "Alice", "Bob", "win", "resigned", 1),
+            game("g2", "Bob", "Alice", "win", "checkmated", 2),
+            game("g3", "Alice", "Bob", "agreed", "agreed", 3),
+            game("g4", "Alice", "Carol", "win", "timeout", 4),
+        ]},
+    }
+    mock_request = AsyncMock(side_effect=lambda endpoint, **kwargs: responses[endpoint])
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        result = await get_head_to_head("alice", "bob")
+
+    assert result["total_games"] == 3
+    assert result["record"] == {"wins": 1, "losses": 1, "draws": 1}
+    assert [g["uuid"] for g in result["games"]] == ["g1", "g2", "g3"]
+    requested = [call.args[0] for call in mock_request.call_args_list]
+    assert "player/alice/games/2023/11" not in requested
+    assert "player/bob/games/2023/12" not in requested
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [0, 2])
+async def test_get_player_game_analytics(workers, worker_pool, monkeypatch):
+    monkeypatch.setattr(config, "analytics_workers", workers)
+    monkeypatch.setattr(config, "analytics_chunk_size", 2)
+    responses = {
+        "player/alice/games/archives": {"archives": [
+            "https://api.chess.com/pub/player/alice/games/2023/11",
+            "https://api.chess.com/pub/player/alice/games/2024/01",
+        ]},
+        "player/alice/games/2023/11/pgn": SAMPLE_PGN,
+        "player/alice/games/2024/01/pgn": SAMPLE_PGN,
+    }
+    mock_request = AsyncMock(side_effect=lambda endpoint, **kwargs: responses[endpoint])
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        result = await get_player_game_analytics("alice")
+
+    assert result["months"] == 2
+    assert result["games"] == 6
+    assert result["time_trouble_rate"] == 0.5
+
+@pytest.mark.asyncio
+async def test_get_player_game_analytics_year_filter(worker_pool, monkeypatch):
+    monkeypatch.setattr(config, "analytics_workers", 0)
+    responses = {
+        "player/alice/games/archives": {"archives": [
+            "https://api.chess.com/pub/player/alice/games/2023/11",
+            "https://api.chess.com/pub/player/alice/games/2024/01",
+        ]},
+        "player/alice/games/2024/01/pgn": SAMPLE_PGN,
+    }
+    mock_request = AsyncMock(side_effect=lambda endpoint, **kwargs: responses[endpoint])
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        result = await get_player_game_analytics("alice", year=2024, time_class="bullet")
+
+    assert result["months"] == 1
+    assert result["games"] == 1
+
+@pytest.mark.asyncio
+async def test_get_player_game_analytics_invalid_time_class():
+    with pytest.raises(ValueError):
+        await get_player_game_analytics("alice", time_class="classical")
+
+@pytest.mark.asyncio
+async def test_get_player_game_analytics_month_without_year():
+    with pytest.raises(ValueError):
+        await get_player_game_analytics("alice", month=11)
+
+@pytest.mark.asyncio
+async def test_get_player_time_management(worker_pool, monkeypatch):
+    monkeypatch.setattr(config, "analytics_workers", 0)
+    responses = {
+        "player/alice/games/archives": {"archives": [
+            "https://api.chess.com/pub/player/alice/games/2023/11",
+        ]},
+        "player/alice/games/2023/11/pgn": SAMPLE_PGN,
+    }
+    mock_request = AsyncMock(side_effect=lambda endpoint, **kwargs: responses[endpoint])
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        result = await get_player_time_management("alice", checkpoint_move=2)
+        cached = await get_player_time_management("alice", time_class="bullet")
+
+    assert result["games"] == 1
+    assert result["average_time_per_move"][1] == 1.0
+    assert result["clock_advantage"]["average_advantage_by_result"]["win"] == 3.0
+    assert cached["games"] == 1
+    assert cached["time_scramble_rate"] == 1.0
+    assert mock_request.call_count == 3
+
+@pytest.mark.asyncio
+async def test_get_player_time_management_invalid_time_class():
+    with pytest.raises(ValueError):
+        await get_player_time_management("alice", time_class="daily")
+    with pytest.raises(ValueError):
+        await get_player_time_management("alice", checkpoint_move=0)
+
+@pytest.mark.asyncio
+async def test_get_rating_history_extends_incrementally():
+    def game(end_time, rating, time_class="blitz"):
+        return {
+            "uuid": str(end_time), "end_time": end_time, "time_class": time_class, "rules": "chess",
+            "white": {"username": "Alice", "rating": rating},
+            "black": {"username": "Bob", "rating": 1400},
+        }
+
+    archives = ["https://api.chess.com/pub/player/alice/games/2023/11"]
+    responses = {
+        "player/alice/games/archives": {"archives": archives},
+        "player/alice/games/2023/11": {"games": [
+            game(1700000000, 1500), game(1700000100, 1510), game(1700000200, 1300, "bullet"),
+        ]},
+        "player/alice/games/2023/12": {"games": [game(1702000000, 1550)]},
+    }
+    mock_request = AsyncMock(side_effect=lambda endpoint, **kwargs: responses[endpoint])
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        first = await get_rating_history("alice", resolution="month")
+        archives.append("https://api.chess.com/pub/player/alice/games/2023/12")
+        second = await get_rating_history("alice", resolution="lttb", points=10)
+
+    assert first["games"] == 2
+    assert first["points"][0]["rating"] == 1510
+    assert [p["rating"] for p in second["points"]] == [1500, 1510, 1550]
+    requested = [call.args[0] for call in mock_request.call_args_list]
+    assert requested.count("player/alice/games/2023/11") == 1
+
+@pytest.mark.asyncio
+async def test_get_rating_history_refetches_month_cached_while_current():
+    def game(end_time, rating):
+        return {
+            "uuid": str(end_time), "end_time": end_time, "time_class": "blitz", "rules": "chess",
+            "white": {"username": "Alice", "rating": rating},
+            "black": {"username": "Bob", "rating": 1400},
+        }
+
+    month_games = [game(1791000000, 1500)]
+    responses = {
+        "player/alice/games/archives": {"archives": [
+            "https://api.chess.com/pub/player/alice/games/2026/10",
+        ]},
+        "player/alice/games/2026/10": {"games": month_games},
+    }
+    mock_request = AsyncMock(side_effect=lambda endpoint, **kwargs: responses[endpoint])
+    with patch("chess_mcp.server.make_api_request", new=mock_request), \
+         patch("chess_mcp.store.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2026, 10, 15, tzinfo=timezone.utc)
+        first = await get_rating_history("alice", resolution="lttb")
+        month_games.append(game(1791500000, 1520))
+        mock_datetime.now.return_value = datetime(2026, 11, 2, tzinfo=timezone.utc)
+        second = await get_rating_history("alice", resolution="lttb")
+        third = await get_rating_history("alice", resolution="lttb")
+
+    assert first["games"] == 1
+    assert second["games"] == third["games"] == 2
+    requested = [call.args[0] for call in mock_request.call_args_list]
+    assert requested.count("player/alice/games/2026/10") == 2
+
+@pytest.mark.asyncio
+async def test_get_rating_history_invalid_arguments():
+    with pytest.raises(ValueError):
+        await get_rating_history("alice", time_class="classical")
+    with pytest.raises(ValueError):
+        await get_rating_history("alice", resolution="hour")
+    with pytest.raises(ValueError):
+        await get_rating_history("alice", resolution="lttb", points=2)
+
+@pytest.mark.asyncio
+async def test_get_rating_history_points_only_checked_for_lttb():
+    mock_request = AsyncMock(return_value={"archives": []})
+    with patch("chess_mcp.server.make_api_request", new=mock_request):
+        result = await get_rating_history("alice", resolution="month", points=0)
+
+    assert result["games"] == 0
+
 @pytest.mark.asyncio
 async def test_get_titled_players():
     mock_data = {"players": ["player1", "player2"]}
@@ -157,12 +411,7 @@ async def test_player_current_games_resource_error():
 
 @pytest.mark.asyncio
 async def test_get_api_request_params():
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"data": "test_data"}
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = MagicMock()
-    mock_client.__aenter__.return_value.get.return_value = mock_response
+    mock_client = mock_stream_client(content=b'{"data": "test_data"}')
 
     params = {"param1": "value1", "param2": "value2"}
 
@@ -170,8 +419,8 @@ async def test_get_api_request_params():
         result = await make_api_request("endpoint/test", params=params)
 
     assert result == {"data": "test_data"}
-    mock_client.__aenter__.return_value.get.assert_called_once()
-    call_args = mock_client.__aenter__.return_value.get.call_args
+    mock_client.__aenter__.return_value.stream.assert_called_once()
+    call_args = mock_client.__aenter__.return_value.stream.call_args
     assert call_args[1]["params"] == params
 
 @pytest.mark.asyncio
@@ -249,19 +498,14 @@ async def test_get_player_game_archives():
 
 @pytest.mark.asyncio
 async def test_make_api_request_non_json():
-    mock_response = MagicMock()
-    mock_response.text = "[Event \"Live Chess\"]\n[Site \"Chess.com\"]\n"
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = MagicMock()
-    mock_client.__aenter__.return_value.get.return_value = mock_response
+    mock_client = mock_stream_client(content=b"[Event \"Live Chess\"]\n[Site \"Chess.com\"]\n")
 
     with patch("httpx.AsyncClient", return_value=mock_client):
         result = await make_api_request("endpoint/test", accept_json=False)
 
     assert result == "[Event \"Live Chess\"]\n[Site \"Chess.com\"]\n"
-    mock_client.__aenter__.return_value.get.assert_called_once()
-    call_args = mock_client.__aenter__.return_value.get.call_args
+    mock_client.__aenter__.return_value.stream.assert_called_once()
+    call_args = mock_client.__aenter__.return_value.stream.call_args
     assert call_args[1]["headers"]["accept"] == "application/x-chess-pgn"
 
 @pytest.mark.asyncio
@@ -277,6 +521,66 @@ async def test_download_player_games_pgn():
     assert call_args[0][0] == "player/testuser/games/2023/12/pgn"
     assert call_args[1]["accept_json"] is False
 
+@pytest.mark.asyncio
+async def test_download_player_games_pgn_large_archive_returns_first_page(monkeypatch):
+    monkeypatch.setattr(config, "max_response_bytes", 16)
+    monkeypatch.setattr(config, "pgn_page_size", 2)
+
+    with patch("httpx.AsyncClient", return_value=mock_stream_client(content=SAMPLE_PGN.encode())):
+        result = await download_player_games_pgn("alice", 2023, 11)
+
+    first_line, pgn = result.split("\n", 1)
+    assert first_line.startswith("% Showing games 1-2 of 3")
+    assert pgn.count("[Event ") == 2
+
+@pytest.mark.asyncio
+async def test_get_player_games_pgn_page_spilled_archive_is_downloaded_once(monkeypatch):
+    monkeypatch.setattr(config, "max_response_bytes", 16)
+    mock_client = mock_stream_client(content=SAMPLE_PGN.encode())
+
+    with patch("httpx.AsyncClient", return_value=mock_client) as mock_client_class:
+        first = await get_player_games_pgn_page("alice", 2023, 11, page=1, page_size=2)
+        second = await get_player_games_pgn_page("alice", 2023, 11, page=2, page_size=2)
+
+    assert (first["total_games"], first["total_pages"]) == (3, 2)
+    assert first["pgn"].count("[Event ") == 2
+    assert '[White "Alice"]\n[Black "Carol"]' in second["pgn"]
+    assert mock_client_class.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_player_games_pgn_page_current_month_is_not_cached(monkeypatch):
+    monkeypatch.setattr(config, "max_response_bytes", 16)
+
+    with patch("httpx.AsyncClient", side_effect=lambda: mock_stream_client(content=SAMPLE_PGN.encode())) \
+            as mock_client_class, \
+         patch("chess_mcp.server.is_past_month", return_value=False):
+        await get_player_games_pgn_page("alice", 2023, 11, page=1, page_size=2)
+        await get_player_games_pgn_page("alice", 2023, 11, page=2, page_size=2)
+
+    assert mock_client_class.call_count == 2
+    assert spool_cache.entries == {}
+
+@pytest.mark.asyncio
+async def test_get_player_games_pgn_page_in_memory_archive(worker_pool):
+    with patch("chess_mcp.server.make_api_request", new=AsyncMock(return_value=SAMPLE_PGN)):
+        result = await get_player_games_pgn_page("alice", 2023, 11, page=3, page_size=1)
+        beyond = await get_player_games_pgn_page("alice", 2023, 11, page=2, page_size=3)
+
+    assert result["total_pages"] == 3
+    assert result["pgn"].startswith('[Event "Let\'s Play!"]')
+    assert result["pgn"].count("[Event ") == 1
+    assert (beyond["total_games"], beyond["pgn"]) == (3, "")
+
+@pytest.mark.asyncio
+async def test_get_player_games_pgn_page_invalid_page():
+    with pytest.raises(ValueError):
+        await get_player_games_pgn_page("alice", 2023, 11, page=0)
+
+@pytest.mark.asyncio
+async def test_get_player_games_pgn_page_zero_page_size():
+    with pytest.raises(ValueError):
+        await get_player_games_pgn_page("alice", 2023, 11, page_size=0)
+
 @pytest.mark.asyncio
 async def test_player_games_pgn_resource():
     mock_pgn = "[Event \"Live Chess\"]\n[Site \"Chess.com\"]\n"
@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+
+from chess_mcp.spool import SPOOLED_BODY, SpoolCache, SpooledBody, iter_response_text, read_response
+
+SAMPLE_PGN = (Path(__file__).parent / "sample_games.pgn").read_text()
+
+
+def spooled(text):
+    file = tempfile.TemporaryFile()
+    file.write(text.encode())
+    return SpooledBody(file, len(text))
+
+def streamed(content, headers=None):
+    return httpx.Response(
+        200, headers=headers, content=content, request=httpx.Request("GET", "https://example.com")
+    )
+
+@pytest.mark.asyncio
+async def test_read_response_keeps_small_bodies_in_memory():
+    response = await read_response(streamed(b"small", {"content-type": "text/plain"}), 16)
+    assert response.text == "small"
+    assert response.headers["content-type"] == "text/plain"
+    assert SPOOLED_BODY not in response.extensions
+
+@pytest.mark.asyncio
+async def test_read_response_spills_past_ceiling():
+    response = await read_response(streamed(SAMPLE_PGN.encode()), 16)
+    body = response.extensions[SPOOLED_BODY]
+    assert body.size == len(SAMPLE_PGN.encode())
+    assert "".join(iter_response_text(response)) == SAMPLE_PGN
+    body.close()
+
+@pytest.mark.asyncio
+async def test_read_response_unbounded_when_disabled():
+    response = await read_response(streamed(SAMPLE_PGN.encode()), 0)
+    assert response.text == SAMPLE_PGN
+
+def test_spooled_body_pages_games():
+    body = spooled(SAMPLE_PGN)
+
+    assert body.game_count == 3
+    assert body.read_games(1, 1).startswith('[Event "Live Chess"]\n[Site "Chess.com"]\n[White "Bob"]')
+    assert body.read_games(1, 10).count("[Event ") == 2
+    assert body.read_games(5, 1) == ""
+    body.close()
+
+def test_spooled_body_iter_text_splits_on_character_boundaries():
+    body = spooled("Ø" * 5)
+    chunks = list(body.iter_text(chunk_size=3))
+    assert "".join(chunks) == "Ø" * 5
+    assert len(chunks) > 1
+    body.close()
+
+def test_spooled_body_reads_json():
+    body = spooled('{"games": []}')
+    assert body.read_json() == {"games": []}
+
+def test_spool_cache_closes_evicted_bodies():
+    cache = SpoolCache(max_size=1)
+    first, second = spooled("a"), spooled("b")
+    cache.put("first", first)
+    cache.put("second", second)
+
+    assert cache.get("first") is None
+    assert first.file.closed
+    lease = cache.get("second")
+    assert lease is second
+    lease.close()
+    assert not second.file.closed
+    cache.clear()
+    assert second.file.closed
+
+def test_spool_cache_keeps_leased_bodies_open_after_eviction():
+    cache = SpoolCache(max_size=1)
+    cache.put("first", spooled(SAMPLE_PGN))
+    leased = cache.get("first")
+    cache.put("second", spooled("b"))
+
+    assert cache.get("first") is None
+    assert not leased.file.closed
+    assert leased.game_count == 3
+    leased.close()
+    assert leased.file.closed
+    cache.clear()
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+
+from chess_mcp.store import GameStore, game_key, is_past_month
+
+
+def make_game(uuid, white, black, end_time=0, white_result="win", black_result="resigned"):
+    return {
+        "uuid": uuid,
+        "url": f"https://www.chess.com/game/live/{uuid}",
+        "end_time": end_time,
+        "white": {"username": white, "result": white_result},
+        "black": {"username": black, "result": black_result},
+    }
+
+def test_game_key_prefers_uuid():
+    assert game_key({"uuid": "abc", "url": "u"}) == "abc"
+    assert game_key({"url": "u"}) == "u"
+    assert game_key({}) is None
+
+def test_is_past_month():
+    now = datetime(2024, 3, 15, tzinfo=timezone.utc)
+    assert is_past_month(2024, 2, now) is True
+    assert is_past_month(2023, 12, now) is True
+    assert is_past_month(2024, 3, now) is False
+    assert is_past_month(2024, 4, now) is False
+
+def test_archives_share_stored_games():
+    store = GameStore()
+    shared = make_game("g1", "Alice", "Bob")
+    store.add_archive("alice", 2024, 1, [shared, make_game("g2", "Alice", "Carol")])
+    store.add_archive("Bob", 2024, 1, [dict(shared)])
+
+    assert len(store.games) == 2
+    assert store.has_archive("bob", 2024, 1)
+    assert store.get_archive("bob", 2024, 1)[0] is store.get_archive("alice", 2024, 1)[0]
+
+def test_games_between_intersects_player_indexes():
+    store = GameStore()
+    store.add_archive("alice", 2024, 1, [
+        make_game("g2", "Bob", "Alice", end_time=20),
+        make_game("g1", "Alice", "Bob", end_time=10),
+        make_game("g3", "Alice", "Carol", end_time=30),
+        {"url": None},
+    ])
+
+    games = store.games_between("ALICE", "bob")
+
+    assert [game["uuid"] for game in games] == ["g1", "g2"]
+    assert store.games_between("bob", "carol") == []
+
+def test_live_archive_is_not_served_as_complete():
+    store = GameStore()
+    store.add_archive("alice", 2024, 1, [make_game("g1", "Alice", "Bob")], complete=False)
+
+    assert not store.has_archive("alice", 2024, 1)
+    assert store.games_between("alice", "bob")
+
+    store.add_archive("alice", 2024, 1, [
+        make_game("g1", "Alice", "Bob"), make_game("g2", "Alice", "Bob")
+    ])
+
+    assert store.has_archive("alice", 2024, 1)
+    assert len(store.get_archive("alice", 2024, 1)) == 2
+
+def test_eviction_drops_least_recently_used_archives():
+    store = GameStore(max_games=3)
+    store.add_archive("alice", 2024, 1, [make_game("g1", "Alice", "Bob"), make_game("g2", "Alice", "Bob")])
+    store.add_archive("bob", 2024, 1, [make_game("g1", "Alice", "Bob")])
+    store.add_archive("carol", 2024, 2, [make_game("g3", "Carol", "Dave")])
+    store.get_archive("alice", 2024, 1)
+    store.add_archive("dave", 2024, 3, [make_game("g4", "Dave", "Erin")])
+
+    assert not store.has_archive("bob", 2024, 1)
+    assert not store.has_archive("carol", 2024, 2)
+    assert store.has_archive("alice", 2024, 1)
+    assert set(store.games) == {"g1", "g2", "g4"}
+    assert "carol" not in store.player_index
+
+def test_clear():
+    store = GameStore()
+    store.add_archive("alice", 2024, 1, [make_game("g1", "Alice", "Bob")])
+    store.clear()
+    assert store.games == {} and store.archives == {} and store.player_index == {}
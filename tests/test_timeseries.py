@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from chess_mcp.timeseries import bucket_series, bucket_start, lttb
+
+
+def ts(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+def test_bucket_start():
+    moment = ts(2024, 3, 14, 15, 30)  # a Thursday
+    assert bucket_start(moment, "day") == ts(2024, 3, 14)
+    assert bucket_start(moment, "week") == ts(2024, 3, 11)
+    assert bucket_start(moment, "month") == ts(2024, 3, 1)
+
+def test_bucket_series():
+    points = [
+        (ts(2024, 3, 1, 10), 1500),
+        (ts(2024, 3, 1, 12), 1530),
+        (ts(2024, 3, 1, 14), 1510),
+        (ts(2024, 3, 2, 9), 1520),
+    ]
+
+    days = bucket_series(points, "day")
+
+    assert days == [
+        {"timestamp": ts(2024, 3, 1), "rating": 1510, "high": 1530, "low": 1500, "games": 3},
+        {"timestamp": ts(2024, 3, 2), "rating": 1520, "high": 1520, "low": 1520, "games": 1},
+    ]
+    assert len(bucket_series(points, "month")) == 1
+    assert bucket_series([], "week") == []
+
+def test_lttb_keeps_endpoints_and_extremes():
+    points = [(i, 1500) for i in range(100)]
+    points[37] = (37, 2000)
+    points[71] = (71, 1000)
+
+    sampled = lttb(points, 10)
+
+    assert len(sampled) == 10
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (37, 2000) in sampled and (71, 1000) in sampled
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+
+def test_lttb_short_series_unchanged():
+    points = [(1, 1), (2, 2), (3, 3)]
+    assert lttb(points, 10) == points
+    assert lttb(points, 2) == points